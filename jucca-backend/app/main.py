@@ -8,6 +8,9 @@ This file uses RELATIVE imports to ensure compatibility with Render deployment.
 import sys
 import os
 import asyncio
+import concurrent.futures
+import fcntl
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Ensure the project root and app directory are in the path
@@ -21,9 +24,9 @@ if str(PROJECT_ROOT) not in sys.path:
 
 # Now use relative imports (with .) which work regardless of PYTHONPATH
 from .core.database import get_db, engine, Base
-from .models import User, BlacklistedKeyword, RestrictedBrand, ProhibitedProduct, ChatHistory, SystemLog
+from .models import User, BlacklistedKeyword, RestrictedBrand, ProhibitedProduct, ChatHistory, SystemLog, PolicyMeta
 from .schemas import ChatRequest, ChatResponse, UserCreate, UserLogin, UserUpdate, UserResponse, PolicyStats, LogResponse, LogQuery
-from .services.policy_engine import PolicyEngine
+from .services.policy_engine import PolicyEngine, bump_policy_version
 from .services.llm_service import (
     generate_explanation, 
     generate_explanation_streaming,
@@ -31,79 +34,391 @@ from .services.llm_service import (
 )
 from .services.nlp_entities import extract_entities
 from .services.memory import get_memory, update_memory
+from .services.caching import ask_cache, build_ask_cache_key
 from .services.auth_service import (
-    authenticate_user, get_password_hash, create_access_token, decode_token
+    authenticate_user, get_password_hash, verify_password, create_access_token, decode_token
 )
 
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Response
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, Request, status, UploadFile, File, Form, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import Optional, AsyncGenerator
-import pandas as pd
-import tempfile
+import logging
 import time
 import json
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+import re
+import base64
+import bisect
+import string
+import hashlib
+import itertools
+import threading
+import collections
+
+# orjson serializes straight to bytes and is 2-5x faster than stdlib json;
+# fall back to stdlib when it is not installed
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    from fastapi.responses import JSONResponse as _DefaultResponse
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+logger = logging.getLogger("jucca.bootstrap")
+
+def _json_dumps(obj) -> str:
+    """Serialize to a str via the fast path; used for audit-log payloads."""
+    return _json_dumps_bytes(obj).decode()
+
+# Set to "1" to force-reset the default account passwords on boot; otherwise
+# existing accounts are left untouched so startup does no hashing work
+FORCE_RESET_DEFAULT_PW = os.getenv("FORCE_RESET_DEFAULT_PW", "0") == "1"
+
+# Hash the fixed development defaults once at import instead of on every
+# bootstrap or reset call; hashing is deliberately the slow part
+ADMIN_DEFAULT_HASH = get_password_hash("admin123")
+SELLER_DEFAULT_HASH = get_password_hash("seller123")
 
 # Create default users if they don't exist
 def create_default_users():
     """Create or reset default admin and seller accounts."""
-    from .services.auth_service import get_password_hash
     from sqlalchemy.orm import Session
     from .core.database import SessionLocal
-    
+
     db = SessionLocal()
     try:
         # Check if admin exists
         admin = db.query(User).filter(User.username == "admin").first()
         if admin:
-            # Update existing admin with correct password
-            admin.password_hash = get_password_hash("admin123")
             admin.role = "admin"
-            print("Updated existing admin account: admin/admin123")
+            # Even when a reset is forced, skip the write if the stored
+            # hash already verifies the default password
+            if FORCE_RESET_DEFAULT_PW and not verify_password("admin123", admin.password_hash):
+                admin.password_hash = ADMIN_DEFAULT_HASH
+                logger.info("Reset existing admin account: admin/admin123")
         else:
             admin = User(
                 username="admin",
-                password_hash=get_password_hash("admin123"),
+                password_hash=ADMIN_DEFAULT_HASH,
                 role="admin"
             )
             db.add(admin)
-            print("Created default admin account: admin/admin123")
+            logger.info("Created default admin account: admin/admin123")
         
         # Check if seller exists
         seller = db.query(User).filter(User.username == "seller").first()
         if seller:
-            # Update existing seller with correct password
-            seller.password_hash = get_password_hash("seller123")
             seller.role = "seller"
-            print("Updated existing seller account: seller/seller123")
+            if FORCE_RESET_DEFAULT_PW and not verify_password("seller123", seller.password_hash):
+                seller.password_hash = SELLER_DEFAULT_HASH
+                logger.info("Reset existing seller account: seller/seller123")
         else:
             seller = User(
                 username="seller",
-                password_hash=get_password_hash("seller123"),
+                password_hash=SELLER_DEFAULT_HASH,
                 role="seller"
             )
             db.add(seller)
-            print("Created default seller account: seller/seller123")
+            logger.info("Created default seller account: seller/seller123")
         
         db.commit()
-        print("Default users initialized successfully")
+        logger.info("Default users initialized successfully")
     except Exception as e:
-        print(f"Error creating default users: {e}")
+        logger.error(f"Error creating default users: {e}")
         db.rollback()
     finally:
         db.close()
 
-# Initialize default users
-create_default_users()
-
 # Create default policy data if database is empty
 POLICY_DATA_VERSION = "2.4.3"
 
+# Module-level cache of the parsed policy file, keyed on mtime, so repeated
+# loader calls (hot reload, multiple init paths) parse the JSON at most once
+_policy_file_cache = {"mtime": None, "data": None}
+
+def _load_policy_data(policy_file: Path):
+    """Parse the policy JSON, reusing the cached tree if the file is unchanged."""
+    mtime = policy_file.stat().st_mtime_ns
+    if _policy_file_cache["mtime"] == mtime and _policy_file_cache["data"] is not None:
+        return _policy_file_cache["data"]
+    with open(policy_file, 'r') as f:
+        data = json.load(f)
+    _policy_file_cache["mtime"] = mtime
+    _policy_file_cache["data"] = data
+    return data
+
+# Sidecar sqlite cache of the fully normalized policy tables. On ephemeral
+# filesystems every cold start re-parses the JSON; restoring from the sidecar
+# turns that into three INSERT INTO ... SELECT statements.
+_POLICY_TABLE_NAMES = (
+    "policy_blacklisted_keywords",
+    "policy_restricted_brands",
+    "policy_prohibited_products",
+)
+
+def _restore_policy_sidecar(sidecar: Path, fingerprint: str) -> bool:
+    """Copy the policy tables from the sidecar cache if its fingerprint matches.
+
+    Returns True on success. Only applies to the sqlite backend, where the
+    cache file can be ATTACHed and copied table-to-table in one transaction.
+    """
+    if engine.dialect.name != "sqlite" or not sidecar.exists():
+        return False
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("ATTACH DATABASE ? AS policy_cache", (str(sidecar),))
+        try:
+            row = cursor.execute(
+                "SELECT value FROM policy_cache.meta WHERE key = 'sha256'"
+            ).fetchone()
+            if row is None or row[0] != fingerprint:
+                return False
+            for table in _POLICY_TABLE_NAMES:
+                cursor.execute(f"INSERT INTO {table} SELECT * FROM policy_cache.{table}")
+            raw.commit()
+            return True
+        finally:
+            cursor.execute("DETACH DATABASE policy_cache")
+    except Exception as e:
+        logger.error(f"Could not restore policy cache: {e}")
+        return False
+    finally:
+        raw.close()
+
+def _write_policy_sidecar(sidecar: Path, fingerprint: str):
+    """Snapshot the freshly loaded policy tables into the sidecar cache."""
+    if engine.dialect.name != "sqlite":
+        return
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("ATTACH DATABASE ? AS policy_cache", (str(sidecar),))
+        for table in _POLICY_TABLE_NAMES:
+            cursor.execute(f"DROP TABLE IF EXISTS policy_cache.{table}")
+            cursor.execute(f"CREATE TABLE policy_cache.{table} AS SELECT * FROM {table}")
+        cursor.execute("CREATE TABLE IF NOT EXISTS policy_cache.meta (key TEXT PRIMARY KEY, value TEXT)")
+        cursor.execute("INSERT OR REPLACE INTO policy_cache.meta VALUES ('sha256', ?)", (fingerprint,))
+        raw.commit()
+        cursor.execute("DETACH DATABASE policy_cache")
+    except Exception as e:
+        logger.error(f"Could not write policy cache: {e}")
+    finally:
+        raw.close()
+
+def _record_policy_fingerprint(db: Session, fingerprint: str):
+    """Store the policy file's sha256 so unchanged boots skip the parse."""
+    db.merge(PolicyMeta(key="policy_sha256", value=fingerprint))
+    db.commit()
+
+def _bulk_copy(db: Session, model, mappings, columns):
+    """Load mappings via COPY on Postgres; fall back to bulk_insert_mappings.
+
+    COPY pays the lock/type-check overhead once for the whole batch instead
+    of once per statement, which is worth ~4x on the full-reload path.
+    """
+    if not mappings:
+        return
+    if engine.dialect.name == "postgresql":
+        import io
+
+        def _field(value):
+            # COPY text-format escaping: backslash first, then the
+            # delimiter and line terminators; csv quoting is NOT valid here
+            if value is None:
+                return r"\N"
+            return (str(value)
+                    .replace("\\", "\\\\")
+                    .replace("\t", "\\t")
+                    .replace("\n", "\\n")
+                    .replace("\r", "\\r"))
+
+        buf = io.StringIO()
+        for row in mappings:
+            buf.write("\t".join(_field(row.get(col)) for col in columns))
+            buf.write("\n")
+        buf.seek(0)
+        cursor = db.connection().connection.cursor()
+        cursor.copy_from(buf, model.__tablename__, columns=columns, sep="\t", null=r"\N")
+    else:
+        db.bulk_insert_mappings(model, mappings)
+
+# Marketplace country codes recognized in per-country product rules
+_COUNTRIES = frozenset(("NG", "KE", "EG", "MA", "IC", "GH", "UG", "TN", "SN", "DZ", "SA"))
+
+def _parse_keywords(blacklisted_keywords, existing_kw, json_version):
+    """Normalize the blacklisted-keywords section into insert mappings."""
+    kw_mappings = []
+    # Handle new format with keyword-based structure
+    # Actual format: {"KeywordName": {"target_type": "...", "status": "...", "countries": [...]}}
+    if isinstance(blacklisted_keywords, dict):
+        seen_keywords = set()  # Track keywords to avoid duplicates in same run
+
+        for keyword_name, keyword_data in blacklisted_keywords.items():
+            if isinstance(keyword_data, dict):
+                keyword_lower = keyword_name.strip().lower()
+
+                # Skip if already processed in this run or already in the DB
+                if keyword_lower in seen_keywords or keyword_lower in existing_kw:
+                    continue
+                seen_keywords.add(keyword_lower)
+
+                # Get countries list if available
+                countries = keyword_data.get("countries", [])
+                if isinstance(countries, list):
+                    scope = ",".join(sorted(countries))
+                else:
+                    scope = "global"
+
+                # Get status (enabled/disabled)
+                status = keyword_data.get("status", "enabled")
+                severity = "high" if status == "enabled" else "medium"
+
+                # Get target_type
+                target_type = keyword_data.get("target_type", "international")
+
+                kw_mappings.append({
+                    "keyword": keyword_lower,
+                    "severity": severity,
+                    "scope": scope,
+                    "description": f"Blacklisted keyword: {keyword_name} [Type: {target_type}, Status: {status}] [v{json_version}]"
+                })
+    elif isinstance(blacklisted_keywords, list):
+        # Old format: [{"keyword": "...", "severity": "...", ...}]
+        for item in blacklisted_keywords:
+            kw_mappings.append({
+                "keyword": item.get("keyword", "").strip().lower(),
+                "severity": item.get("severity", "high"),
+                "scope": item.get("scope", "global"),
+                "description": item.get("description")
+            })
+    return kw_mappings
+
+def _parse_brands(restricted_brands, existing_brand_names):
+    """Normalize the restricted-brands section into insert mappings."""
+    brand_mappings = []
+    # Handle new format with nested brand categories
+    if isinstance(restricted_brands, dict):
+        for category_key, category_data in restricted_brands.items():
+            if isinstance(category_data, dict):
+                description = category_data.get("description", "")
+
+                # Handle nested brands object
+                brands_data = category_data.get("brands", {})
+                if isinstance(brands_data, dict):
+                    for brand_name, brand_info in brands_data.items():
+                        if isinstance(brand_info, dict):
+                            restriction_type = brand_info.get("restriction_type", "restricted")
+                            note = brand_info.get("note", description)
+
+                            brand_clean = brand_name.strip()
+                            if brand_clean not in existing_brand_names:
+                                existing_brand_names.add(brand_clean)
+                                brand_mappings.append({
+                                    "brand": brand_clean,
+                                    "category": category_key,
+                                    "country": None,
+                                    "status": restriction_type.lower().replace(" ", "_"),
+                                    "condition": note
+                                })
+
+                # Handle simple brands array
+                elif isinstance(brands_data, list):
+                    for brand_name in brands_data:
+                        if isinstance(brand_name, str):
+                            brand_clean = brand_name.strip()
+                            if brand_clean not in existing_brand_names:
+                                existing_brand_names.add(brand_clean)
+                                brand_mappings.append({
+                                    "brand": brand_clean,
+                                    "category": category_key,
+                                    "country": None,
+                                    "status": "restricted",
+                                    "condition": description
+                                })
+
+    elif isinstance(restricted_brands, list):
+        # Old format: [{"brand": "...", "category": "...", ...}]
+        for item in restricted_brands:
+            brand_mappings.append({
+                "brand": item.get("brand", "").strip(),
+                "category": item.get("category"),
+                "country": item.get("country"),
+                "status": item.get("status", "restricted"),
+                "condition": item.get("condition")
+            })
+    return brand_mappings
+
+def _parse_products(prohibited_products, existing_products):
+    """Normalize the prohibited-products section into insert mappings."""
+    product_mappings = []
+    # Handle new format with country-specific rules
+    # JSON format: {"ProductName": {"NG": "Blocked", "KE": "Open", ...}}
+    if isinstance(prohibited_products, dict):
+        for product_key, product_data in prohibited_products.items():
+            if isinstance(product_data, dict):
+                product_name = product_key  # Use the key as the product name
+                product_lower = product_name.lower()
+
+                # Check if this is the new format with "name" and "rules" keys
+                if "rules" in product_data and isinstance(product_data["rules"], dict):
+                    # New format: {"ProductName": {"name": "...", "rules": {"NG": "Blocked"}}}
+                    rules = product_data["rules"]
+                    for country, status in rules.items():
+                        if status and str(status).strip():
+                            # Preserve the actual status value from the JSON
+                            status_value = str(status).strip()
+                            if (product_lower, country) not in existing_products:
+                                existing_products.add((product_lower, country))
+                                product_mappings.append({
+                                    "keyword": product_lower,
+                                    "category": product_key,
+                                    "country": country,
+                                    "status": status_value,
+                                    "notes": f"{status} in {country}"
+                                })
+                else:
+                    # Our format: {"ProductName": {"NG": "Blocked", "KE": "Open", ...}}
+                    # Keys are country codes (NG, KE, EG, etc.)
+                    for country, status in product_data.items():
+                        if status and str(status).strip():
+                            # Only process valid country codes
+                            if country in _COUNTRIES:
+                                # Preserve the actual status value from the JSON
+                                status_value = str(status).strip()
+                                if (product_lower, country) not in existing_products:
+                                    existing_products.add((product_lower, country))
+                                    product_mappings.append({
+                                        "keyword": product_lower,
+                                        "category": product_key,
+                                        "country": country,
+                                        "status": status_value,
+                                        "notes": f"{status} in {country}"
+                                    })
+
+    elif isinstance(prohibited_products, list):
+        # Old format: [{"keyword": "...", "category": "...", ...}]
+        for item in prohibited_products:
+            product_mappings.append({
+                "keyword": item.get("keyword", "").strip(),
+                "category": item.get("category"),
+                "country": item.get("country"),
+                "status": item.get("status", "prohibited"),
+                "notes": item.get("notes")
+            })
+    return product_mappings
+
 def initialize_default_policies():
     """Initialize default policy data from JSON file - handles both old and new formats with version checking."""
     from sqlalchemy.orm import Session
@@ -114,17 +429,28 @@ def initialize_default_policies():
         # Check if we need to reload based on version
         policy_file = Path(__file__).parent.parent / "data" / "policy_data.json"
         if not policy_file.exists():
-            print("Policy data file not found")
+            logger.info("Policy data file not found")
             db.close()
             return
         
-        with open(policy_file, 'r') as f:
-            policy_data = json.load(f)
-        
-        # Check if we need to reload based on version
-        json_version = policy_data.get("version", "1.0")
         existing_keywords = db.query(BlacklistedKeyword).count()
         existing_brands = db.query(RestrictedBrand).count()
+
+        # Fast path: one SELECT against the metadata table decides whether
+        # anything changed; only a new file hash forces the full JSON parse.
+        # Stored in the database (not a sidecar file) so it also survives
+        # redeploys on Postgres
+        fingerprint = hashlib.sha256(policy_file.read_bytes()).hexdigest()
+        stored = db.query(PolicyMeta.value).filter(PolicyMeta.key == "policy_sha256").scalar()
+        if stored == fingerprint and existing_keywords >= 500:
+            logger.info(f"Policy data unchanged (checksum match, {existing_keywords} keywords). No reload needed.")
+            db.close()
+            return
+
+        policy_data = _load_policy_data(policy_file)
+
+        # Check if we need to reload based on version
+        json_version = policy_data.get("version", "1.0")
         
         # Always reload comprehensive policy data (version 2.0+) if database has old format data
         # This ensures the new comprehensive data is always loaded on restart
@@ -153,24 +479,24 @@ def initialize_default_policies():
                         expected_brand_count += len(brands)
         
         if existing_keywords == 0:
-            print("Database is empty, loading comprehensive policy data...")
+            logger.info("Database is empty, loading comprehensive policy data...")
             needs_reload = True
         elif json_version != POLICY_DATA_VERSION:
             # Version mismatch - reload to ensure we have the correct data
-            print(f"Version mismatch: JSON={json_version}, Expected={POLICY_DATA_VERSION}")
-            print(f"Reloading comprehensive policy data...")
+            logger.info(f"Version mismatch: JSON={json_version}, Expected={POLICY_DATA_VERSION}")
+            logger.info(f"Reloading comprehensive policy data...")
             needs_reload = True
         elif expected_keyword_count > 0 and existing_keywords < (expected_keyword_count * 0.8):
             # Data appears incomplete (less than 80% of expected keywords)
-            print(f"Data incomplete: found {existing_keywords} keywords, expected ~{expected_keyword_count}")
-            print(f"Reloading comprehensive policy data...")
+            logger.info(f"Data incomplete: found {existing_keywords} keywords, expected ~{expected_keyword_count}")
+            logger.info(f"Reloading comprehensive policy data...")
             needs_reload = True
         elif json_version.startswith("2.") and existing_keywords < 500:
             # Version 2.x format and we don't have comprehensive data yet
-            print(f"Reloading comprehensive policy data (found {existing_keywords} old records)...")
+            logger.info(f"Reloading comprehensive policy data (found {existing_keywords} old records)...")
             needs_reload = True
         else:
-            print(f"Policy data current ({existing_keywords} keywords, {existing_brands} brands, version {json_version}). No reload needed.")
+            logger.info(f"Policy data current ({existing_keywords} keywords, {existing_brands} brands, version {json_version}). No reload needed.")
             db.close()
             return
         
@@ -180,241 +506,134 @@ def initialize_default_policies():
         
         # Clear existing data if this is a reload (not initial load)
         if existing_keywords > 0:
-            print("Clearing existing policy data...")
+            logger.info("Clearing existing policy data...")
             db.query(BlacklistedKeyword).delete()
             db.query(RestrictedBrand).delete()
             db.query(ProhibitedProduct).delete()
             db.commit()
-        
-        keywords_count = 0
-        brands_count = 0
-        products_count = 0
-        
-        # Parse new comprehensive format
-        blacklisted_keywords = policy_data.get("blacklisted_keywords", {})
-        restricted_brands = policy_data.get("restricted_brands", {})
-        prohibited_products = policy_data.get("prohibited_products", {})
-        
-        # Handle new format with keyword-based structure
-        # Actual format: {"KeywordName": {"target_type": "...", "status": "...", "countries": [...]}}
-        if isinstance(blacklisted_keywords, dict):
-            seen_keywords = set()  # Track keywords to avoid duplicates in same run
-            
-            for keyword_name, keyword_data in blacklisted_keywords.items():
-                if isinstance(keyword_data, dict):
-                    keyword_lower = keyword_name.strip().lower()
-                    
-                    # Skip if already processed in this run
-                    if keyword_lower in seen_keywords:
-                        continue
-                    seen_keywords.add(keyword_lower)
-                    
-                    # Get countries list if available
-                    countries = keyword_data.get("countries", [])
-                    if isinstance(countries, list):
-                        scope = ",".join(sorted(countries))
-                    else:
-                        scope = "global"
-                    
-                    # Get status (enabled/disabled)
-                    status = keyword_data.get("status", "enabled")
-                    severity = "high" if status == "enabled" else "medium"
-                    
-                    # Get target_type
-                    target_type = keyword_data.get("target_type", "international")
-                    
-                    # Use merge to handle existing entries gracefully
-                    keyword = BlacklistedKeyword(
-                        keyword=keyword_lower,
-                        severity=severity,
-                        scope=scope,
-                        description=f"Blacklisted keyword: {keyword_name} [Type: {target_type}, Status: {status}] [v{json_version}]"
-                    )
-                    db.merge(keyword)
-                    keywords_count += 1
-        elif isinstance(blacklisted_keywords, list):
-            # Old format: [{"keyword": "...", "severity": "...", ...}]
-            for item in blacklisted_keywords:
-                keyword = BlacklistedKeyword(
-                    keyword=item.get("keyword", "").strip().lower(),
-                    severity=item.get("severity", "high"),
-                    scope=item.get("scope", "global"),
-                    description=item.get("description")
-                )
-                db.add(keyword)
-                keywords_count += 1
-        
-        # Handle new format with nested brand categories
-        if isinstance(restricted_brands, dict):
-            for category_key, category_data in restricted_brands.items():
-                if isinstance(category_data, dict):
-                    description = category_data.get("description", "")
-                    
-                    # Handle nested brands object
-                    brands_data = category_data.get("brands", {})
-                    if isinstance(brands_data, dict):
-                        for brand_name, brand_info in brands_data.items():
-                            if isinstance(brand_info, dict):
-                                restriction_type = brand_info.get("restriction_type", "restricted")
-                                note = brand_info.get("note", description)
-                                
-                                # Check if brand already exists
-                                existing = db.query(RestrictedBrand).filter(
-                                    RestrictedBrand.brand == brand_name.strip()
-                                ).first()
-                                if not existing:
-                                    brand = RestrictedBrand(
-                                        brand=brand_name.strip(),
-                                        category=category_key,
-                                        country=None,
-                                        status=restriction_type.lower().replace(" ", "_"),
-                                        condition=note
-                                    )
-                                    db.add(brand)
-                                    brands_count += 1
-                    
-                    # Handle simple brands array
-                    elif isinstance(brands_data, list):
-                        for brand_name in brands_data:
-                            if isinstance(brand_name, str):
-                                existing = db.query(RestrictedBrand).filter(
-                                    RestrictedBrand.brand == brand_name.strip()
-                                ).first()
-                                if not existing:
-                                    brand = RestrictedBrand(
-                                        brand=brand_name.strip(),
-                                        category=category_key,
-                                        country=None,
-                                        status="restricted",
-                                        condition=description
-                                    )
-                                    db.add(brand)
-                                    brands_count += 1
-                    
-                    # Handle brands with country restrictions
-                    elif isinstance(brands_data, dict):
-                        for brand_name, brand_info in brands_data.items():
-                            if isinstance(brand_info, dict) and "countries" in brand_info:
-                                restriction_type = brand_info.get("restriction_type", "restricted")
-                                note = brand_info.get("note", description)
-                                
-                                existing = db.query(RestrictedBrand).filter(
-                                    RestrictedBrand.brand == brand_name.strip()
-                                ).first()
-                                if not existing:
-                                    brand = RestrictedBrand(
-                                        brand=brand_name.strip(),
-                                        category=category_key,
-                                        country=None,
-                                        status=restriction_type.lower().replace(" ", "_"),
-                                        condition=note
-                                    )
-                                    db.add(brand)
-                                    brands_count += 1
-        
-        elif isinstance(restricted_brands, list):
-            # Old format: [{"brand": "...", "category": "...", ...}]
-            for item in restricted_brands:
-                brand = RestrictedBrand(
-                    brand=item.get("brand", "").strip(),
-                    category=item.get("category"),
-                    country=item.get("country"),
-                    status=item.get("status", "restricted"),
-                    condition=item.get("condition")
-                )
-                db.add(brand)
-                brands_count += 1
-        
-        # Handle new format with country-specific rules
-        # JSON format: {"ProductName": {"NG": "Blocked", "KE": "Open", ...}}
-        if isinstance(prohibited_products, dict):
-            for product_key, product_data in prohibited_products.items():
-                if isinstance(product_data, dict):
-                    product_name = product_key  # Use the key as the product name
-
-                    # Check if this is the new format with "name" and "rules" keys
-                    if "rules" in product_data and isinstance(product_data["rules"], dict):
-                        # New format: {"ProductName": {"name": "...", "rules": {"NG": "Blocked"}}}
-                        rules = product_data["rules"]
-                        for country, status in rules.items():
-                            if status and str(status).strip():
-                                # Preserve the actual status value from the JSON
-                                status_value = str(status).strip()
-                                existing = db.query(ProhibitedProduct).filter(
-                                    ProhibitedProduct.keyword == product_name.lower(),
-                                    ProhibitedProduct.country == country
-                                ).first()
-                                if not existing:
-                                    product = ProhibitedProduct(
-                                        keyword=product_name.lower(),
-                                        category=product_key,
-                                        country=country,
-                                        status=status_value,
-                                        notes=f"{status} in {country}"
-                                    )
-                                    db.add(product)
-                                    products_count += 1
-                    else:
-                        # Our format: {"ProductName": {"NG": "Blocked", "KE": "Open", ...}}
-                        # Keys are country codes (NG, KE, EG, etc.)
-                        for country, status in product_data.items():
-                            if status and str(status).strip():
-                                # Only process valid country codes
-                                if country in ["NG", "KE", "EG", "MA", "IC", "GH", "UG", "TN", "SN", "DZ", "SA"]:
-                                    # Preserve the actual status value from the JSON
-                                    status_value = str(status).strip()
-                                    existing = db.query(ProhibitedProduct).filter(
-                                        ProhibitedProduct.keyword == product_name.lower(),
-                                        ProhibitedProduct.country == country
-                                    ).first()
-                                    if not existing:
-                                        product = ProhibitedProduct(
-                                            keyword=product_name.lower(),
-                                            category=product_key,
-                                            country=country,
-                                            status=status_value,
-                                            notes=f"{status} in {country}"
-                                        )
-                                        db.add(product)
-                                        products_count += 1
-        
-        elif isinstance(prohibited_products, list):
-            # Old format: [{"keyword": "...", "category": "...", ...}]
-            for item in prohibited_products:
-                product = ProhibitedProduct(
-                    keyword=item.get("keyword", "").strip(),
-                    category=item.get("category"),
-                    country=item.get("country"),
-                    status=item.get("status", "prohibited"),
-                    notes=item.get("notes")
-                )
-                db.add(product)
-                products_count += 1
-        
+
+        # Try the sidecar cache first: if a previous boot already normalized
+        # this exact JSON, copy the finished tables instead of re-parsing
+        sidecar = policy_file.parent / "policy_data.sqlite"
+        if _restore_policy_sidecar(sidecar, fingerprint):
+            restored = db.query(BlacklistedKeyword).count()
+            logger.info(f"✓ Policy data restored from sidecar cache ({restored} keywords)")
+            _record_policy_fingerprint(db, fingerprint)
+            db.close()
+            return
+
+        # Pre-fetch existing keys into sets so dedup is O(1) in memory
+        # instead of one SELECT per candidate row
+        existing_kw = {r[0] for r in db.query(BlacklistedKeyword.keyword).all()}
+        existing_brand_names = {r[0] for r in db.query(RestrictedBrand.brand).all()}
+        existing_products = {(r[0], r[1]) for r in db.query(ProhibitedProduct.keyword, ProhibitedProduct.country).all()}
+
+        # Normalize each section into plain dict mappings for one bulk
+        # insert per table; the per-format branching lives in the helpers
+        kw_mappings = _parse_keywords(
+            policy_data.get("blacklisted_keywords", {}), existing_kw, json_version)
+        brand_mappings = _parse_brands(
+            policy_data.get("restricted_brands", {}), existing_brand_names)
+        product_mappings = _parse_products(
+            policy_data.get("prohibited_products", {}), existing_products)
+
+        # Single bulk load per table (COPY on Postgres), one transaction
+        _bulk_copy(db, BlacklistedKeyword, kw_mappings,
+                   ["keyword", "severity", "scope", "description"])
+        _bulk_copy(db, RestrictedBrand, brand_mappings,
+                   ["brand", "category", "country", "status", "condition"])
+        _bulk_copy(db, ProhibitedProduct, product_mappings,
+                   ["keyword", "category", "country", "status", "notes"])
         db.commit()
-        print(f"✓ Comprehensive policy data loaded successfully:")
-        print(f"  - {keywords_count} blacklisted keywords")
-        print(f"  - {brands_count} restricted brands")
-        print(f"  - {products_count} prohibited products")
+        logger.info(f"✓ Comprehensive policy data loaded successfully:")
+        logger.info(f"  - {len(kw_mappings)} blacklisted keywords")
+        logger.info(f"  - {len(brand_mappings)} restricted brands")
+        logger.info(f"  - {len(product_mappings)} prohibited products")
+
+        # Persist the fingerprint so the next boot can skip the parse
+        # entirely, and snapshot the tables for fast restore
+        _write_policy_sidecar(sidecar, fingerprint)
+        _record_policy_fingerprint(db, fingerprint)
         
     except Exception as e:
-        print(f"Error initializing default policies: {e}")
+        logger.error(f"Error initializing default policies: {e}")
         import traceback
         traceback.print_exc()
         db.rollback()
     finally:
         db.close()
 
-# Initialize default policies
-initialize_default_policies()
+# Arbitrary but fixed id for the Postgres bootstrap advisory lock
+BOOTSTRAP_LOCK_ID = 874512
+
+def _run_bootstrap():
+    Base.metadata.create_all(bind=engine)
+    create_default_users()
+    initialize_default_policies()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run schema creation and default-data bootstrap once at startup.
+
+    Only one uvicorn worker performs the heavy bootstrap: on Postgres an
+    advisory lock arbitrates (and works across hosts), on sqlite a
+    non-blocking file lock does. The losers skip straight through.
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            got = conn.execute(text(f"SELECT pg_try_advisory_lock({BOOTSTRAP_LOCK_ID})")).scalar()
+            if got:
+                try:
+                    _run_bootstrap()
+                finally:
+                    conn.execute(text(f"SELECT pg_advisory_unlock({BOOTSTRAP_LOCK_ID})"))
+            else:
+                # Wait for the winner to finish before serving traffic; on a
+                # cold deploy the tables do not exist until it is done
+                logger.info("Bootstrap running in another worker, waiting")
+                conn.execute(text(f"SELECT pg_advisory_lock({BOOTSTRAP_LOCK_ID})"))
+                conn.execute(text(f"SELECT pg_advisory_unlock({BOOTSTRAP_LOCK_ID})"))
+    else:
+        lock_file = open(PROJECT_ROOT / ".bootstrap.lock", "w")
+        try:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Wait for the winner to finish before serving traffic; on a
+                # cold deploy the tables do not exist until it is done
+                logger.info("Bootstrap running in another worker, waiting")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                _run_bootstrap()
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            lock_file.close()
+    # One engine instance shared by all requests
+    app.state.policy_engine = PolicyEngine()
+    # Warm the in-process blacklist set so the first /ask never pays the load
+    from .core.database import SessionLocal
+    db = SessionLocal()
+    try:
+        _load_blacklist_set(db)
+    finally:
+        db.close()
+    yield
+
 
 app = FastAPI(
     title="JUCCA API",
     description="Jumia Content Compliance Assistant - Conversational Compliance System with GPT4All",
-    version="1.1.0"
+    version="1.1.0",
+    lifespan=lifespan,
+    default_response_class=_DefaultResponse
 )
 
 # CORS
+# Compress larger responses (the Prometheus text format in particular
+# shrinks several-fold under gzip); small payloads skip the codec
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -425,21 +644,120 @@ app.add_middleware(
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Request tracking for metrics
+# Request tracking for metrics. next() on itertools.count increments in C
+# under a single bytecode, so threadpool workers cannot lose updates the
+# way the old "count += 1" read-modify-write could.
+_request_counter = itertools.count(1)
 request_count = 0
-request_times = []
+request_times = collections.deque(maxlen=10000)
+
+# Cumulative duration histogram, updated O(1) per request: one bisect to
+# pick the bucket plus two adds. /metrics reads these counters directly
+# instead of re-bucketing the sample window, and they are monotonic the
+# way Prometheus expects; the deque above only feeds the percentiles.
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_duration_bucket_counts = [0] * (len(DURATION_BUCKETS) + 1)  # last is +Inf
+_duration_totals = {"sum": 0.0, "count": 0}
+_duration_lock = threading.Lock()
+
+def _observe_request_time(elapsed: float):
+    """Record one request duration in the percentile window and histogram.
+
+    The += updates are read-modify-writes from threadpool threads, so they
+    sit under a lock; its cost is noise next to the request itself.
+    """
+    with _duration_lock:
+        request_times.append(elapsed)
+        _duration_bucket_counts[bisect.bisect_left(DURATION_BUCKETS, elapsed)] += 1
+        _duration_totals["sum"] += elapsed
+        _duration_totals["count"] += 1
 
 # Guest session token (simple token for guest access)
 GUEST_TOKEN = "guest_access_token_"
 
+# Guest session ids: a counter plus pid is collision-free, unlike the old
+# int(time.time()) which merged every guest arriving in the same second
+_guest_counter = itertools.count(1)
+
+def get_policy_engine(request: Request) -> PolicyEngine:
+    """Dependency returning the app-wide PolicyEngine instance."""
+    return request.app.state.policy_engine
+
+# Short-lived cache of authenticated users so burst admin traffic does not
+# pay a SELECT per request; 30s bounds staleness after role changes
+_user_cache = {}
+USER_CACHE_TTL = 30
+
+# Admin dashboard aggregates: log stats tolerate 60s of staleness, and the
+# admin head-count is explicitly invalidated on every user write
+_log_stats_cache = {"expires": 0.0, "data": None}
+_admin_count_cache = {"count": None}
+LOG_STATS_TTL = 60
+
+# Component health probes for /health/detailed, shared between the
+# frequent liveness scrapes for a few seconds
+_component_health_cache = {"expires": 0.0, "components": None}
+COMPONENT_HEALTH_TTL = 5
+
+# LLM status aggregation shared by /metrics and /status; a 1s TTL
+# decouples the Prometheus scrape rate from the aggregation cost
+_llm_status_cache = {"expires": 0.0, "data": None}
+LLM_STATUS_TTL = 1
+
+def _get_llm_status():
+    now = time.time()
+    if _llm_status_cache["data"] is None or _llm_status_cache["expires"] <= now:
+        _llm_status_cache["data"] = llm_service.get_status()
+        _llm_status_cache["expires"] = now + LLM_STATUS_TTL
+    return _llm_status_cache["data"]
+
+def write_log(level: str, category: str, message: str, user_id=None, extra_data=None):
+    """Write an audit log row on its own session; runs off the request path."""
+    from .core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.add(SystemLog(
+            level=level,
+            category=category,
+            message=message,
+            user_id=user_id,
+            extra_data=extra_data
+        ))
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error writing audit log: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+def _get_admin_count(db: Session) -> int:
+    """Number of admin accounts, cached until the next user write."""
+    if _admin_count_cache["count"] is None:
+        _admin_count_cache["count"] = db.query(User).filter(User.role == "admin").count()
+    return _admin_count_cache["count"]
+
+def _invalidate_user_caches():
+    _admin_count_cache["count"] = None
+    _user_cache.clear()
+
 # Dependency to get current user
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     payload = decode_token(token)
     if payload is None:
         raise HTTPException(status_code=401, detail="Invalid token")
-    user = db.query(User).filter(User.username == payload.get("sub")).first()
+    username = payload.get("sub")
+
+    cached = _user_cache.get(username)
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
+
+    user = db.query(User).filter(User.username == username).first()
     if user is None:
+        _user_cache.pop(username, None)
         raise HTTPException(status_code=401, detail="User not found")
+    db.expunge(user)  # detach so the instance survives this session's close
+    _user_cache[username] = (time.time() + USER_CACHE_TTL, user)
     return user
 
 
@@ -447,58 +765,116 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
 # Special Question Handlers
 # ============================================
 
+# The blacklist table is small and mostly-read, so the full keyword set
+# lives in-process; membership checks never touch the database. Dropped
+# whenever a policy reload rewrites the table, and refreshed on a short
+# TTL so other uvicorn workers pick up writes they did not make.
+_blacklist_set = {"expires": 0.0, "keywords": None}
+BLACKLIST_SET_TTL = 10
+
+def _load_blacklist_set(db: Session) -> set:
+    if _blacklist_set["keywords"] is None or time.time() >= _blacklist_set["expires"]:
+        _blacklist_set["keywords"] = {k for (k,) in db.query(BlacklistedKeyword.keyword).all()}
+        _blacklist_set["expires"] = time.time() + BLACKLIST_SET_TTL
+    return _blacklist_set["keywords"]
+
+def _invalidate_blacklist_set():
+    _blacklist_set["keywords"] = None
+
 def check_and_add_blacklisted_keyword(db: Session, keyword: str):
     """Check if a keyword exists in blacklist, add it if not, and return whether it was added."""
     keyword_lower = keyword.strip().lower()
-    existing = db.query(BlacklistedKeyword).filter(
-        BlacklistedKeyword.keyword == keyword_lower
-    ).first()
-    
-    if not existing:
-        new_keyword = BlacklistedKeyword(
-            keyword=keyword_lower,
-            severity="high",
-            scope="global",
-            description=f"Blacklisted keyword added via compliance check: {keyword_lower}"
-        )
-        db.add(new_keyword)
+    if keyword_lower in _load_blacklist_set(db):
+        return False  # Already existed
+
+    new_keyword = BlacklistedKeyword(
+        keyword=keyword_lower,
+        severity="high",
+        scope="global",
+        description=f"Blacklisted keyword added via compliance check: {keyword_lower}"
+    )
+    db.add(new_keyword)
+    try:
         db.commit()
-        return True  # Was added
-    return False  # Already existed
+    except IntegrityError:
+        # Another worker inserted it between our set refreshes
+        db.rollback()
+        _blacklist_set["keywords"].add(keyword_lower)
+        return False  # Already existed
+    _blacklist_set["keywords"].add(keyword_lower)
+    bump_policy_version()
+    # Cached /ask answers predate the new keyword; drop them like the
+    # upload path does so they cannot keep serving Allowed
+    ask_cache.clear()
+    return True  # Was added
+
 
+# Brand data changes only through admin uploads, so the grouped answer is
+# memoized briefly and dropped whenever RestrictedBrand rows are written
+_brand_list_cache = {"expires": 0.0, "data": None}
+BRAND_LIST_TTL = 60
+
+def _invalidate_brand_list_cache():
+    _brand_list_cache["data"] = None
 
 def get_authorized_brands_list(db: Session):
     """Get list of brands that require authorization."""
-    brands = db.query(RestrictedBrand).all()
-    
-    # Group by brand name and collect their conditions
-    brand_conditions = {}
-    for brand in brands:
-        brand_name = brand.brand.strip()
-        if brand_name not in brand_conditions:
-            brand_conditions[brand_name] = {
-                "category": brand.category,
-                "condition": brand.condition or "Authorization required",
-                "status": brand.status
-            }
-        else:
-            # Update condition if this one is more specific
-            if brand.condition:
-                brand_conditions[brand_name]["condition"] = brand.condition
-    
+    from sqlalchemy import func
+
+    if _brand_list_cache["data"] is not None and _brand_list_cache["expires"] > time.time():
+        return _brand_list_cache["data"]
+
+    # Group in SQL and fetch only the four columns used; max() keeps a
+    # non-null condition when a brand has several rows, so no ORM objects
+    # need hydrating just to be folded together in Python
+    rows = db.query(
+        func.trim(RestrictedBrand.brand),
+        func.max(RestrictedBrand.category),
+        func.max(RestrictedBrand.status),
+        func.max(RestrictedBrand.condition),
+    ).group_by(func.trim(RestrictedBrand.brand)).all()
+
+    brand_conditions = {
+        brand: {
+            "category": category,
+            "condition": condition or "Authorization required",
+            "status": status
+        }
+        for brand, category, status, condition in rows
+    }
+    _brand_list_cache["data"] = brand_conditions
+    _brand_list_cache["expires"] = time.time() + BRAND_LIST_TTL
     return brand_conditions
 
 
-def handle_special_question(db: Session, question: str):
-    """Handle special question patterns with custom responses."""
-    q_lower = question.lower().strip()
-    
+# Special-question trigger phrases, compiled once into a single alternation:
+# one linear scan over the question sets every flag instead of a dozen
+# separate substring searches
+SPECIAL_QUESTION_RX = re.compile(
+    r"(?P<brand>what brand|which brand|brands? require|brands? need)"
+    r"|(?P<auth>authori[sz](?:ation|ed))"
+    r"|(?P<fake>fake|counterfeit|replica)"
+    r"|(?P<used>used|secondhand|refurbished)"
+)
+
+def handle_special_question(db: Session, question: str, q_lower: Optional[str] = None):
+    """Handle special question patterns with custom responses.
+
+    Callers that already lowercased the question can pass it via q_lower
+    to avoid a second string copy per request.
+    """
+    if q_lower is None:
+        q_lower = question.casefold().strip()
+
+    # Most questions trigger nothing special; bail before collecting flags
+    if SPECIAL_QUESTION_RX.search(q_lower) is None:
+        return None
+
+    flags = {m.lastgroup for m in SPECIAL_QUESTION_RX.finditer(q_lower)}
+
     # Pattern: "What brands require authorization?"
     # Match various phrasings like "what brands require authorization?", "Which brands need authorization?", etc.
-    has_brand_keyword = any(phrase in q_lower for phrase in ["what brand", "which brand", "brands require", "brand require", "brands need", "brand need"])
-    has_auth_keyword = any(phrase in q_lower for phrase in ["authorization", "authorisation", "authorized", "authorised"])
-    
-    if has_brand_keyword and has_auth_keyword:
+    if "brand" in flags and "auth" in flags:
         brands = get_authorized_brands_list(db)
         if brands:
             brand_list = "\n".join([f"• {name} - {info['condition']}" for name, info in list(brands.items())[:20]])
@@ -515,7 +891,7 @@ def handle_special_question(db: Session, question: str):
             }
     
     # Pattern: "can i sell fake products?" or similar
-    if "fake" in q_lower or "counterfeit" in q_lower or "replica" in q_lower:
+    if "fake" in flags:
         # Check and add "fake" to blacklist if not present
         was_added = check_and_add_blacklisted_keyword(db, "fake")
         
@@ -533,7 +909,7 @@ def handle_special_question(db: Session, question: str):
             }
     
     # Pattern: "can i list used electronics?" or "can i sell used products?"
-    if ("used" in q_lower or "secondhand" in q_lower or "refurbished" in q_lower):
+    if "used" in flags:
         # Check if "used" is in prohibited products or blacklisted keywords
         used_prohibited = db.query(ProhibitedProduct).filter(
             ProhibitedProduct.keyword == "used"
@@ -565,10 +941,10 @@ def handle_special_question(db: Session, question: str):
 # ============================================
 
 @app.post("/token")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Authenticate user and return JWT token."""
     global request_count
-    request_count += 1
+    request_count = next(_request_counter)
     
     user = authenticate_user(form_data.username, form_data.password, db)
     if not user:
@@ -577,10 +953,10 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     return {"access_token": access_token, "token_type": "bearer", "role": user.role}
 
 @app.post("/register")
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user."""
     global request_count
-    request_count += 1
+    request_count = next(_request_counter)
     
     existing = db.query(User).filter(User.username == user_data.username).first()
     if existing:
@@ -600,45 +976,93 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 # Compliance Endpoints
 # ============================================
 
+# Fixed SSE frame fragments for /ask/stream, encoded once at import; the
+# per-token path only serializes the chunk string itself
+_SSE_CONTENT_PREFIX = b'data: {"type":"content","chunk":'
+_SSE_FRAME_END = b"}\n\n"
+_SSE_DONE_FRAME = b'data: {"type":"done"}\n\n'
+
+
+def _write_chat_history(session_id: str, question: str, decision: str, reason: str):
+    """Persist one chat exchange on its own session; runs off the request path."""
+    from .core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.add(ChatHistory(
+            session_id=session_id,
+            question=question,
+            decision=decision,
+            reason=reason
+        ))
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error writing chat history: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _resolve_question_context(session_id: str, question: str, memory=None):
+    """Shared /ask preamble: extract entities, merge session memory, persist it."""
+    if memory is None:
+        memory = get_memory(session_id)
+    entities = extract_entities(question)
+    category = entities.get("category") or memory.get("category")
+    country = entities.get("country") or memory.get("country")
+    update_memory(session_id, {
+        "brand": entities.get("brand"),
+        "category": category,
+        "country": country
+    })
+    return entities, country, category
+
+
 @app.post("/ask", response_model=ChatResponse)
 async def ask_compliance_question(
     q: ChatRequest, 
-    db: Session = Depends(get_db)
+    background: BackgroundTasks,
+    db: Session = Depends(get_db),
+    policy_engine: PolicyEngine = Depends(get_policy_engine)
 ):
     """Main endpoint for compliance questions with streaming support."""
-    global request_count, request_times
+    global request_count
     start_time = time.time()
-    request_count += 1
+    request_count = next(_request_counter)
     
+    # Lowercase once; downstream matching reuses this copy
+    q_lower = q.question.casefold().strip()
+
     # Get session memory
     memory = get_memory(q.session_id)
-    
-    # Extract entities from question
-    entities = extract_entities(q.question)
-    
-    # Apply memory context if available
-    category = entities.get("category") or memory.get("category")
-    country = entities.get("country") or memory.get("country")
-    
-    # Update memory
-    update_memory(q.session_id, {
-        "brand": entities.get("brand"),
-        "category": category,
-        "country": country
-    })
+
+    # Repeat questions skip extraction, the policy pass and LLM inference;
+    # the cached payload carries the entities, so memory still advances
+    cache_key = build_ask_cache_key(
+        q.question, memory.get("country"), memory.get("category"), q.role)
+    cached = ask_cache.get(cache_key)
+    if cached is not None:
+        update_memory(q.session_id, {
+            "brand": cached["entities"].get("brand"),
+            "category": cached["entities"].get("category") or memory.get("category"),
+            "country": cached["entities"].get("country") or memory.get("country")
+        })
+        background.add_task(
+            _write_chat_history, q.session_id, q.question,
+            cached["decision"], cached["reason"])
+        _observe_request_time(time.time() - start_time)
+        return ChatResponse(**cached)
+
+    entities, country, category = _resolve_question_context(
+        q.session_id, q.question, memory)
     
     # Check for special question patterns first
-    special_result = handle_special_question(db, q.question)
+    special_result = handle_special_question(db, q.question, q_lower)
     if special_result:
-        # Save to chat history
-        chat = ChatHistory(
-            session_id=q.session_id,
-            question=q.question,
-            decision=special_result["decision"],
-            reason=special_result["reason"]
-        )
-        db.add(chat)
-        db.commit()
+        # Save to chat history after the response goes out
+        background.add_task(
+            _write_chat_history, q.session_id, q.question,
+            special_result["decision"], special_result["reason"])
         
         return ChatResponse(
             decision=special_result["decision"],
@@ -647,16 +1071,18 @@ async def ask_compliance_question(
             entities=entities
         )
     
-    # Run compliance check
-    policy_engine = PolicyEngine(db)
-    result = policy_engine.check_compliance(
+    # Run compliance check off the event loop - it does blocking DB work
+    result = await run_in_threadpool(
+        policy_engine.check_compliance,
+        db,
         q.question, 
         country=country, 
         category=category
     )
     
-    # Generate LLM explanation
-    answer = generate_explanation(
+    # Generate LLM explanation off the event loop - inference is blocking
+    answer = await run_in_threadpool(
+        generate_explanation,
         question=q.question,
         decision=result["decision"],
         reason=result["reason"],
@@ -664,22 +1090,23 @@ async def ask_compliance_question(
         detected_entities=entities
     )
     
-    # Save to chat history
-    chat = ChatHistory(
-        session_id=q.session_id,
-        question=q.question,
-        decision=result["decision"],
-        reason=result["reason"]
-    )
-    db.add(chat)
-    db.commit()
+    # Save to chat history after the response goes out; the write is not
+    # part of the answer and should not hold the client on a commit
+    background.add_task(
+        _write_chat_history, q.session_id, q.question,
+        result["decision"], result["reason"])
     
-    # Track request time
+    # Track request time; the deque evicts the oldest sample automatically
     elapsed = time.time() - start_time
-    request_times.append(elapsed)
-    if len(request_times) > 1000:
-        request_times = request_times[-1000:]
-    
+    _observe_request_time(elapsed)
+
+    ask_cache.set(cache_key, {
+        "decision": result["decision"],
+        "reason": result["reason"],
+        "answer": answer,
+        "entities": entities
+    })
+
     return ChatResponse(
         decision=result["decision"],
         reason=result["reason"],
@@ -690,32 +1117,34 @@ async def ask_compliance_question(
 
 @app.post("/ask/guest", response_model=ChatResponse)
 async def ask_compliance_question_guest(
-    q: ChatRequest
+    q: ChatRequest,
+    policy_engine: PolicyEngine = Depends(get_policy_engine)
 ):
     """Guest endpoint for compliance questions - no authentication required."""
-    global request_count, request_times
+    global request_count
     start_time = time.time()
-    request_count += 1
+    request_count = next(_request_counter)
     
     # Create a new session for guest
-    session_id = q.session_id or f"guest_{int(time.time())}"
+    session_id = q.session_id or f"guest_{next(_guest_counter)}_{os.getpid()}"
     
     # Get session memory
     memory = get_memory(session_id)
-    
-    # Extract entities from question
-    entities = extract_entities(q.question)
-    
-    # Apply memory context if available
-    category = entities.get("category") or memory.get("category")
-    country = entities.get("country") or memory.get("country")
-    
-    # Update memory
-    update_memory(session_id, {
-        "brand": entities.get("brand"),
-        "category": category,
-        "country": country
-    })
+
+    cache_key = build_ask_cache_key(
+        q.question, memory.get("country"), memory.get("category"), "guest")
+    cached = ask_cache.get(cache_key)
+    if cached is not None:
+        update_memory(session_id, {
+            "brand": cached["entities"].get("brand"),
+            "category": cached["entities"].get("category") or memory.get("category"),
+            "country": cached["entities"].get("country") or memory.get("country")
+        })
+        _observe_request_time(time.time() - start_time)
+        return ChatResponse(**cached)
+
+    entities, country, category = _resolve_question_context(
+        session_id, q.question, memory)
     
     # Get database session
     from .core.database import SessionLocal
@@ -723,7 +1152,7 @@ async def ask_compliance_question_guest(
     
     try:
         # Check for special question patterns first
-        special_result = handle_special_question(db, q.question)
+        special_result = handle_special_question(db, q.question, q.question.casefold().strip())
         if special_result:
             return ChatResponse(
                 decision=special_result["decision"],
@@ -733,8 +1162,8 @@ async def ask_compliance_question_guest(
             )
         
         # Run compliance check
-        policy_engine = PolicyEngine(db)
         result = policy_engine.check_compliance(
+            db,
             q.question, 
             country=country, 
             category=category
@@ -742,7 +1171,8 @@ async def ask_compliance_question_guest(
         
         # Generate LLM explanation with error handling
         try:
-            answer = generate_explanation(
+            answer = await run_in_threadpool(
+                generate_explanation,
                 question=q.question,
                 decision=result["decision"],
                 reason=result["reason"],
@@ -754,12 +1184,17 @@ async def ask_compliance_question_guest(
             print(f"LLM service error for guest: {llm_error}")
             answer = result["reason"]
         
-        # Track request time
+        # Track request time; the deque evicts the oldest sample automatically
         elapsed = time.time() - start_time
-        request_times.append(elapsed)
-        if len(request_times) > 1000:
-            request_times = request_times[-1000:]
-        
+        _observe_request_time(elapsed)
+
+        ask_cache.set(cache_key, {
+            "decision": result["decision"],
+            "reason": result["reason"],
+            "answer": answer,
+            "entities": entities
+        })
+
         return ChatResponse(
             decision=result["decision"],
             reason=result["reason"],
@@ -781,60 +1216,125 @@ async def ask_compliance_question_guest(
 @app.post("/ask/stream")
 async def ask_compliance_question_streaming(
     q: ChatRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    policy_engine: PolicyEngine = Depends(get_policy_engine)
 ):
     """Streaming endpoint for compliance questions."""
     global request_count
-    request_count += 1
-    
-    # Get session memory
-    memory = get_memory(q.session_id)
-    
-    # Extract entities
-    entities = extract_entities(q.question)
-    
-    # Apply memory context
-    category = entities.get("category") or memory.get("category")
-    country = entities.get("country") or memory.get("country")
+    request_count = next(_request_counter)
     
-    # Update memory
-    update_memory(q.session_id, {
-        "brand": entities.get("brand"),
-        "category": category,
-        "country": country
-    })
+    # Run the shared preamble off the event loop - extraction is CPU-bound
+    entities, country, category = await run_in_threadpool(
+        _resolve_question_context, q.session_id, q.question)
     
-    # Run compliance check
-    policy_engine = PolicyEngine(db)
-    result = policy_engine.check_compliance(
+    result = await run_in_threadpool(
+        policy_engine.check_compliance,
+        db,
         q.question,
         country=country,
         category=category
     )
     
-    # Generate streaming response
+    # Generate streaming response with proper SSE framing. LLM chunks are
+    # produced by a worker thread and handed over via an asyncio queue so
+    # the event loop never blocks between tokens.
+    _stream_done = object()
+
     async def generate_stream():
-        yield json.dumps({
+        yield b"data: " + _json_dumps_bytes({
             "type": "decision",
             "decision": result["decision"],
             "reason": result["reason"],
             "entities": entities
-        }) + "\n"
-        
-        for chunk in generate_explanation_streaming(
-            question=q.question,
-            decision=result["decision"],
-            reason=result["reason"],
-            role=q.role,
-            detected_entities=entities
-        ):
-            yield json.dumps({"type": "content", "chunk": chunk}) + "\n"
-        
-        yield json.dumps({"type": "done"}) + "\n"
-    
+        }) + b"\n\n"
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        loop = asyncio.get_running_loop()
+        consumer_alive = True
+
+        def _offer(item) -> bool:
+            """Hand one item to the consumer; False once the consumer is gone.
+
+            The timeout keeps a client disconnect from wedging this worker
+            thread on a full queue forever - the cancelled consumer never
+            drains it. While the consumer lives, a timeout is just
+            backpressure and the put is retried.
+            """
+            while consumer_alive:
+                fut = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+                try:
+                    fut.result(timeout=1.0)
+                    return True
+                except concurrent.futures.TimeoutError:
+                    if not fut.cancel():
+                        return True  # the put won the race after all
+            return False
+
+        def pump():
+            try:
+                for chunk in generate_explanation_streaming(
+                    question=q.question,
+                    decision=result["decision"],
+                    reason=result["reason"],
+                    role=q.role,
+                    detected_entities=entities
+                ):
+                    if not _offer(chunk):
+                        break
+            finally:
+                _offer(_stream_done)
+
+        pump_task = asyncio.create_task(run_in_threadpool(pump))
+
+        # Batch tokens per frame with a growth policy: the first frame is a
+        # single token for low time-to-first-token, then the limit grows
+        # 1 -> 3 -> 9 -> 27 -> 50. A batch also flushes once 20ms pass
+        # without filling, so slow decoding never stalls delivery. Cuts
+        # HTTP/ASGI frame overhead by an order of magnitude at steady state.
+        batch_limit = 1
+        buf = []
+        deadline = 0.0
+        try:
+            while True:
+                if buf:
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        try:
+                            chunk = await asyncio.wait_for(queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            chunk = None  # flush on timeout
+                    else:
+                        chunk = None
+                else:
+                    chunk = await queue.get()
+                    deadline = time.monotonic() + 0.02
+                done = chunk is _stream_done
+                if chunk is not None and not done:
+                    buf.append(chunk)
+                if buf and (done or chunk is None or len(buf) >= batch_limit):
+                    yield _SSE_CONTENT_PREFIX + _json_dumps_bytes("".join(buf)) + _SSE_FRAME_END
+                    buf = []
+                    batch_limit = min(batch_limit * 3, 50)
+                if done:
+                    break
+        finally:
+            # Runs on client disconnect too (the generator is cancelled
+            # here); dropping the flag lets the pump thread exit instead of
+            # blocking on a queue nobody reads
+            consumer_alive = False
+        await pump_task
+
+        yield _SSE_DONE_FRAME
+
     return StreamingResponse(
         generate_stream(),
-        media_type="text/event-stream"
+        media_type="text/event-stream",
+        headers={
+            # Stop proxies from buffering the stream
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "Connection": "keep-alive"
+        }
     )
 
 
@@ -846,7 +1346,8 @@ async def ask_compliance_question_streaming(
 async def upload_policy(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    policy_engine: PolicyEngine = Depends(get_policy_engine)
 ):
     """Upload and process policy file (Excel, PDF, or DOCX)."""
     if current_user.role not in ["admin", "legal"]:
@@ -864,25 +1365,31 @@ async def upload_policy(
     else:
         raise HTTPException(status_code=400, detail="Unsupported file format. Please upload .xlsx, .pdf, or .docx files")
     
-    # Save uploaded file
+    # Save uploaded file, streaming in 1 MiB chunks to keep memory bounded
+    import tempfile
     with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        content = await file.read()
-        tmp.write(content)
+        while chunk := await file.read(1 << 20):
+            tmp.write(chunk)
         tmp_path = tmp.name
     
     try:
-        # Process the file based on type
-        policy_engine = PolicyEngine(db)
-        
+        # Process the file off the event loop - parsing large documents is
+        # CPU-bound and would otherwise stall every concurrent request
         if suffix == '.xlsx':
-            results = policy_engine.rebuild_from_excel(tmp_path)
+            results = await run_in_threadpool(policy_engine.rebuild_from_excel, db, tmp_path)
         elif suffix == '.pdf':
             # For PDF files, extract text and create a simple format
-            results = process_pdf_policy(tmp_path, policy_engine, db)
+            results = await run_in_threadpool(process_pdf_policy, tmp_path, policy_engine, db)
         else:
             # For DOCX files
-            results = process_docx_policy(tmp_path, policy_engine, db)
+            results = await run_in_threadpool(process_docx_policy, tmp_path, policy_engine, db)
         
+        # Uploaded documents may have changed the brand and keyword tables,
+        # which also invalidates any cached /ask decisions
+        _invalidate_brand_list_cache()
+        _invalidate_blacklist_set()
+        bump_policy_version()
+        ask_cache.clear()
         return {"status": "success", "results": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -896,10 +1403,8 @@ def process_pdf_policy(filepath: str, policy_engine: PolicyEngine, db: Session):
         from pypdf import PdfReader
         
         reader = PdfReader(filepath)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        
+        text = "\n".join(page.extract_text() or "" for page in reader.pages)
+
         # Parse the extracted text (simple keyword extraction)
         return parse_text_to_policies(text, policy_engine, db)
     except Exception as e:
@@ -912,82 +1417,98 @@ def process_docx_policy(filepath: str, policy_engine: PolicyEngine, db: Session)
         from docx import Document
         
         doc = Document(filepath)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        
+        text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
+
         # Parse the extracted text
         return parse_text_to_policies(text, policy_engine, db)
     except Exception as e:
         raise Exception(f"Failed to process DOCX: {e}")
 
 
+# Marker words for classifying policy-document lines; checked by token-set
+# intersection, a hash probe per word instead of a regex scan per line.
+# Matching is whole-word: tokens are stripped of surrounding punctuation
+# so prose lines ("... are prohibited.") still classify, and plural forms
+# are listed explicitly because, unlike the original substring scan,
+# "brand" no longer matches inside "brands".
+_KEYWORD_MARKERS = frozenset((
+    "fake", "fakes", "counterfeit", "counterfeits", "replica", "replicas",
+    "knockoff", "knockoffs", "illegal", "prohibited"))
+_BRAND_MARKERS = frozenset(("brand", "brands", "nike", "adidas", "gucci", "apple", "samsung"))
+_PRODUCT_MARKERS = frozenset((
+    "product", "products", "drug", "drugs", "weapon", "weapons", "alcohol", "tobacco"))
+
+
 def parse_text_to_policies(text: str, policy_engine: PolicyEngine, db: Session):
     """Parse extracted text into policy entries."""
     from ..models import BlacklistedKeyword, RestrictedBrand, ProhibitedProduct
-    
+
     results = {"keywords": 0, "brands": 0, "products": 0}
-    
+
     # Simple parsing - look for keywords, brands, products
-    keywords = []
-    brands = []
-    products = []
-    
+    # Sets give O(1) dedup instead of scanning a list per line
+    keywords = set()
+    brands = set()
+    products = set()
+
     lines = text.lower().split('\n')
-    
+
     for line in lines:
         line = line.strip()
         if not line:
             continue
-        
-        # Simple heuristics for classification
-        if any(word in line for word in ['fake', 'counterfeit', 'replica', 'knockoff', 'illegal', 'prohibited']):
-            if line not in keywords:
-                keywords.append(line[:100])  # Truncate if too long
+
+        # Simple heuristics for classification - tokenize once, then a set
+        # intersection per category
+        tokens = {word.strip(string.punctuation) for word in line.split()}
+
+        if tokens & _KEYWORD_MARKERS:
+            truncated = line[:100]  # Truncate if too long
+            if truncated not in keywords:
+                keywords.add(truncated)
                 results["keywords"] += 1
-        
-        if any(word in line for word in ['brand', 'nike', 'adidas', 'gucci', 'apple', 'samsung']):
-            if line not in brands:
-                brands.append(line[:100])
+
+        if tokens & _BRAND_MARKERS:
+            truncated = line[:100]
+            if truncated not in brands:
+                brands.add(truncated)
                 results["brands"] += 1
-        
-        if any(word in line for word in ['product', 'drug', 'weapon', 'alcohol', 'tobacco']):
-            if line not in products:
-                products.append(line[:100])
+
+        if tokens & _PRODUCT_MARKERS:
+            truncated = line[:100]
+            if truncated not in products:
+                products.add(truncated)
                 results["products"] += 1
     
-    # Add to database
-    for kw_text in keywords:
-        kw = BlacklistedKeyword(
-            keyword=kw_text,
-            severity="high",
-            scope="global",
-            description=f"Extracted from uploaded policy document"
-        )
-        db.add(kw)
-    
-    for brand_text in brands:
-        brand = RestrictedBrand(
-            brand=brand_text,
-            status="restricted",
-            condition="Authorization required"
-        )
-        db.add(brand)
-    
-    for product_text in products:
-        product = ProhibitedProduct(
-            keyword=product_text,
-            status="prohibited",
-            notes="Extracted from uploaded policy document"
-        )
-        db.add(product)
-    
+    # Add to database - one bulk insert per table, one commit
+    if keywords:
+        db.bulk_insert_mappings(BlacklistedKeyword, [{
+            "keyword": kw_text,
+            "severity": "high",
+            "scope": "global",
+            "description": "Extracted from uploaded policy document"
+        } for kw_text in keywords])
+
+    if brands:
+        db.bulk_insert_mappings(RestrictedBrand, [{
+            "brand": brand_text,
+            "status": "restricted",
+            "condition": "Authorization required"
+        } for brand_text in brands])
+
+    if products:
+        db.bulk_insert_mappings(ProhibitedProduct, [{
+            "keyword": product_text,
+            "status": "prohibited",
+            "notes": "Extracted from uploaded policy document"
+        } for product_text in products])
+
     db.commit()
-    
+
     return results
 
 @app.get("/admin/policy-stats", response_model=PolicyStats)
-async def get_policy_stats(
+def get_policy_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -995,10 +1516,17 @@ async def get_policy_stats(
     if current_user.role not in ["admin", "legal"]:
         raise HTTPException(status_code=403, detail="Admin access required")
     
+    # One round-trip for all three counts instead of three separate queries
+    row = db.execute(text(
+        "SELECT"
+        " (SELECT COUNT(*) FROM policy_restricted_brands),"
+        " (SELECT COUNT(*) FROM policy_blacklisted_keywords),"
+        " (SELECT COUNT(*) FROM policy_prohibited_products)"
+    )).one()
     return PolicyStats(
-        total_brands=db.query(RestrictedBrand).count(),
-        total_keywords=db.query(BlacklistedKeyword).count(),
-        total_products=db.query(ProhibitedProduct).count()
+        total_brands=row[0],
+        total_keywords=row[1],
+        total_products=row[2]
     )
 
 @app.delete("/admin/cache")
@@ -1010,6 +1538,7 @@ async def clear_cache(
         raise HTTPException(status_code=403, detail="Admin access required")
     
     llm_service.clear_cache()
+    ask_cache.clear()
     return {"status": "success", "message": "Cache cleared"}
 
 
@@ -1017,23 +1546,52 @@ async def clear_cache(
 # User Management Endpoints
 # ============================================
 
-@app.get("/admin/users", response_model=list[UserResponse])
-async def get_users(
+@app.get("/admin/users")
+def get_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all users with pagination."""
+    """Get all users with pagination.
+
+    Passing the opaque `after` cursor (from the X-Next-Cursor response
+    header) seeks directly to the next page instead of scanning and
+    discarding `skip` rows.
+    """
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
-    
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+
+    # Select the serialized columns directly: no ORM instances to build
+    # and no per-row Pydantic validation pass on the way out
+    query = db.query(User.id, User.username, User.role, User.created_at).order_by(User.id)
+    if after is not None:
+        try:
+            query = query.filter(User.id > int(after))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    elif skip:
+        query = query.offset(skip)  # legacy offset path
+    rows = query.limit(limit).all()
+
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return [
+        {
+            "id": row.id,
+            "username": row.username,
+            "role": row.role,
+            "created_at": row.created_at.isoformat() if row.created_at else None
+        }
+        for row in rows
+    ]
 
 @app.post("/admin/users", response_model=UserResponse)
-async def create_user(
+def create_user(
     user_data: UserCreate,
+    background: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -1041,11 +1599,6 @@ async def create_user(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    # Check if username already exists
-    existing = db.query(User).filter(User.username == user_data.username).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Username already exists")
-    
     # Validate role
     if user_data.role not in ["admin", "seller", "legal"]:
         raise HTTPException(status_code=400, detail="Invalid role. Must be admin, seller, or legal")
@@ -1056,26 +1609,36 @@ async def create_user(
         role=user_data.role
     )
     db.add(user)
+    # Let the unique index on username arbitrate instead of a separate
+    # exists-SELECT: one round trip and no duplicate-insert race window
+    try:
+        db.flush()  # assign user.id without an intermediate commit
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Username already exists")
+
     db.commit()
     db.refresh(user)
-    
-    # Log the action
-    log = SystemLog(
+    _invalidate_user_caches()
+
+    # The response does not depend on the audit log being durable;
+    # write it after the reply has gone out
+    background.add_task(
+        write_log,
         level="info",
         category="admin",
         message=f"Created new user: {user_data.username} with role: {user_data.role}",
         user_id=current_user.id,
-        extra_data=json.dumps({"action": "create_user", "target_user": user_data.username})
+        extra_data=_json_dumps({"action": "create_user", "target_user": user_data.username})
     )
-    db.add(log)
-    db.commit()
-    
+
     return user
 
 @app.put("/admin/users/{user_id}", response_model=UserResponse)
-async def update_user(
+def update_user(
     user_id: int,
     user_data: UserUpdate,
+    background: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -1083,51 +1646,59 @@ async def update_user(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Identity-map-aware PK lookup; no query compile, and no SQL at all
+    # if the row is already in the session
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Prevent modifying the last admin
     if user.role == "admin" and user.id == current_user.id:
-        admin_count = db.query(User).filter(User.role == "admin").count()
-        if admin_count <= 1:
+        if _get_admin_count(db) <= 1:
             raise HTTPException(status_code=400, detail="Cannot modify the last admin account")
     
+    # Serialize the payload once and reuse it for both the field updates
+    # and the audit log below
+    updates = user_data.model_dump(exclude_none=True)
+
     # Update fields if provided
-    if user_data.username is not None:
-        # Check if new username is taken
-        existing = db.query(User).filter(User.username == user_data.username, User.id != user_id).first()
-        if existing:
+    if "username" in updates:
+        # Check if new username is taken; select just the id instead of
+        # hydrating a full User row only to throw it away
+        taken = db.query(User.id).filter(
+            User.username == updates["username"], User.id != user_id
+        ).limit(1).scalar()
+        if taken is not None:
             raise HTTPException(status_code=400, detail="Username already exists")
-        user.username = user_data.username
-    
-    if user_data.password is not None:
-        user.password_hash = get_password_hash(user_data.password)
-    
-    if user_data.role is not None:
-        if user_data.role not in ["admin", "seller", "legal"]:
+        user.username = updates["username"]
+
+    if "password" in updates:
+        user.password_hash = get_password_hash(updates["password"])
+
+    if "role" in updates:
+        if updates["role"] not in ["admin", "seller", "legal"]:
             raise HTTPException(status_code=400, detail="Invalid role. Must be admin, seller, or legal")
-        user.role = user_data.role
-    
+        user.role = updates["role"]
+
     db.commit()
     db.refresh(user)
-    
-    # Log the action
-    log = SystemLog(
+    _invalidate_user_caches()
+
+    background.add_task(
+        write_log,
         level="info",
         category="admin",
         message=f"Updated user: {user.username} (ID: {user_id})",
         user_id=current_user.id,
-        extra_data=json.dumps({"action": "update_user", "user_id": user_id, "updates": user_data.model_dump(exclude_none=True)})
+        extra_data=_json_dumps({"action": "update_user", "user_id": user_id, "updates": updates})
     )
-    db.add(log)
-    db.commit()
-    
+
     return user
 
 @app.delete("/admin/users/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
+    background: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -1135,7 +1706,7 @@ async def delete_user(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -1145,25 +1716,23 @@ async def delete_user(
     
     # Prevent deleting the last admin
     if user.role == "admin":
-        admin_count = db.query(User).filter(User.role == "admin").count()
-        if admin_count <= 1:
+        if _get_admin_count(db) <= 1:
             raise HTTPException(status_code=400, detail="Cannot delete the last admin account")
     
     username = user.username
     db.delete(user)
     db.commit()
-    
-    # Log the action
-    log = SystemLog(
+    _invalidate_user_caches()
+
+    background.add_task(
+        write_log,
         level="warning",
         category="admin",
         message=f"Deleted user: {username} (ID: {user_id})",
         user_id=current_user.id,
-        extra_data=json.dumps({"action": "delete_user", "user_id": user_id, "deleted_username": username})
+        extra_data=_json_dumps({"action": "delete_user", "user_id": user_id, "deleted_username": username})
     )
-    db.add(log)
-    db.commit()
-    
+
     return {"status": "success", "message": f"User {username} deleted successfully"}
 
 
@@ -1171,23 +1740,34 @@ async def delete_user(
 # Logs Endpoints
 # ============================================
 
-@app.get("/admin/logs", response_model=list[LogResponse])
-async def get_logs(
+@app.get("/admin/logs")
+def get_logs(
+    response: Response,
     level: str = None,
     category: str = None,
     start_date: str = None,
     end_date: str = None,
     limit: int = 100,
     offset: int = 0,
+    after: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get system logs with filtering and pagination."""
+    """Get system logs with filtering and pagination.
+
+    Deep pages should use the opaque `after` cursor (X-Next-Cursor response
+    header): it seeks on id so page 100 costs the same as page 1, where
+    OFFSET would scan and discard all preceding rows.
+    """
     if current_user.role not in ["admin", "legal"]:
         raise HTTPException(status_code=403, detail="Admin access required")
-    
-    query = db.query(SystemLog)
-    
+
+    # Select the serialized columns directly: no ORM instances to build
+    # and no per-row Pydantic validation pass on the way out
+    query = db.query(
+        SystemLog.id, SystemLog.level, SystemLog.category, SystemLog.message,
+        SystemLog.user_id, SystemLog.ip_address, SystemLog.created_at)
+
     # Apply filters
     if level:
         query = query.filter(SystemLog.level == level)
@@ -1197,57 +1777,92 @@ async def get_logs(
         query = query.filter(SystemLog.created_at >= start_date)
     if end_date:
         query = query.filter(SystemLog.created_at <= end_date)
-    
-    # Order by created_at descending and apply pagination
-    logs = query.order_by(SystemLog.created_at.desc()).offset(offset).limit(limit).all()
-    
-    return logs
+
+    if after is not None:
+        try:
+            _, _, id_raw = base64.urlsafe_b64decode(after).decode().partition("|")
+            cursor_id = int(id_raw)
+        except (ValueError, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # Ids are monotonic and the sort ends on id desc, so seeking on id
+        # alone is correct and sidesteps timestamp-precision mismatches
+        # between the cursor and what the backend stores (the timestamp
+        # stays in the cursor for readability only)
+        query = query.filter(SystemLog.id < cursor_id)
+        logs = query.order_by(SystemLog.created_at.desc(), SystemLog.id.desc()).limit(limit).all()
+    else:
+        # Order by created_at descending and apply pagination
+        logs = query.order_by(SystemLog.created_at.desc(), SystemLog.id.desc()).offset(offset).limit(limit).all()
+
+    if len(logs) == limit:
+        last = logs[-1]
+        cursor = f"{last.created_at.isoformat()}|{last.id}".encode()
+        response.headers["X-Next-Cursor"] = base64.urlsafe_b64encode(cursor).decode()
+    return [
+        {
+            "id": row.id,
+            "level": row.level,
+            "category": row.category,
+            "message": row.message,
+            "user_id": row.user_id,
+            "ip_address": row.ip_address,
+            "created_at": row.created_at.isoformat() if row.created_at else None
+        }
+        for row in logs
+    ]
 
 @app.get("/admin/logs/stats")
-async def get_log_stats(
+def get_log_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get log statistics."""
     if current_user.role not in ["admin", "legal"]:
         raise HTTPException(status_code=403, detail="Admin access required")
-    
-    from sqlalchemy import func
-    
-    # Count by level
-    level_counts = dict(
-        db.query(SystemLog.level, func.count(SystemLog.id))
-        .group_by(SystemLog.level)
-        .all()
-    )
-    
-    # Count by category
-    category_counts = dict(
-        db.query(SystemLog.category, func.count(SystemLog.id))
-        .group_by(SystemLog.category)
-        .all()
-    )
-    
-    # Total count
-    total = db.query(SystemLog).count()
-    
-    # Recent errors (last 24 hours)
+
+    # These aggregates scan the whole logs table; serve dashboard polls
+    # from a short-TTL cache instead of rescanning every few seconds
+    if _log_stats_cache["data"] is not None and _log_stats_cache["expires"] > time.time():
+        return _log_stats_cache["data"]
+
+    from sqlalchemy import and_, func
     from datetime import datetime, timedelta
     yesterday = datetime.utcnow() - timedelta(days=1)
-    recent_errors = db.query(SystemLog).filter(
-        SystemLog.level == "error",
-        SystemLog.created_at >= yesterday
-    ).count()
-    
-    return {
+
+    # One scan instead of four: group by (level, category) and fold the
+    # recent-errors count in as a filtered aggregate, then roll the
+    # per-level / per-category / total figures up in Python
+    rows = db.query(
+        SystemLog.level,
+        SystemLog.category,
+        func.count(SystemLog.id),
+        func.count(SystemLog.id).filter(
+            and_(SystemLog.level == "error", SystemLog.created_at >= yesterday)
+        )
+    ).group_by(SystemLog.level, SystemLog.category).all()
+
+    level_counts = {}
+    category_counts = {}
+    total = 0
+    recent_errors = 0
+    for log_level, log_category, count, recent in rows:
+        level_counts[log_level] = level_counts.get(log_level, 0) + count
+        category_counts[log_category] = category_counts.get(log_category, 0) + count
+        total += count
+        recent_errors += recent
+
+    stats = {
         "total": total,
         "by_level": level_counts,
         "by_category": category_counts,
         "recent_errors_24h": recent_errors
     }
+    _log_stats_cache["data"] = stats
+    _log_stats_cache["expires"] = time.time() + LOG_STATS_TTL
+    return stats
 
 @app.post("/admin/logs")
-async def create_log(
+def create_log(
     log_data: dict,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -1262,7 +1877,7 @@ async def create_log(
         message=log_data.get("message", ""),
         user_id=current_user.id,
         ip_address=log_data.get("ip_address"),
-        extra_data=json.dumps(log_data.get("extra_data")) if log_data.get("extra_data") else None
+        extra_data=_json_dumps(log_data.get("extra_data")) if log_data.get("extra_data") else None
     )
     db.add(log)
     db.commit()
@@ -1275,8 +1890,11 @@ async def create_log(
 # ============================================
 
 @app.get("/health")
-async def health_check():
+async def health_check(response: Response):
     """Basic health check endpoint."""
+    # Probes hit this many times a second; let clients and any proxy
+    # in between reuse the answer briefly
+    response.headers["Cache-Control"] = "public, max-age=5"
     return {
         "status": "healthy", 
         "service": "JUCCA API",
@@ -1284,79 +1902,119 @@ async def health_check():
     }
 
 @app.get("/health/detailed")
-async def detailed_health_check():
+async def detailed_health_check(request: Request):
     """Detailed health check with component status."""
     from .services.llm_service import gpt4all_manager, cloud_client, load_manager
     
-    # Check components
-    components = {
-        "database": "healthy",
-        "gpt4all": "healthy" if gpt4all_manager.is_healthy() else "unavailable",
-        "cloud_fallback": "available" if cloud_client.is_available() else "unavailable",
-        "cache": "healthy"
-    }
-    
+    # Probe components concurrently (the cloud check may hit the network)
+    # and reuse a recent result: liveness probes scrape this every few
+    # seconds but component health does not change second-to-second
+    now = time.time()
+    if _component_health_cache["components"] is not None and _component_health_cache["expires"] > now:
+        components = _component_health_cache["components"]
+    else:
+        gpt4all_ok, cloud_ok = await asyncio.gather(
+            asyncio.to_thread(gpt4all_manager.is_healthy),
+            asyncio.to_thread(cloud_client.is_available),
+        )
+        components = {
+            "database": "healthy",
+            "gpt4all": "healthy" if gpt4all_ok else "unavailable",
+            "cloud_fallback": "available" if cloud_ok else "unavailable",
+            "cache": "healthy"
+        }
+        _component_health_cache["components"] = components
+        _component_health_cache["expires"] = now + COMPONENT_HEALTH_TTL
+
     # Overall status
     overall = "healthy"
     for status in components.values():
         if status == "unavailable":
             overall = "degraded"
             break
-    
-    return {
+
+    body = _json_dumps_bytes({
         "status": overall,
         "components": components,
         "version": "1.1.0"
-    }
+    })
+    # ETag lets frequent scrapers short-circuit with a 304 while the
+    # component picture is unchanged
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    headers = {"Cache-Control": "public, max-age=2", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # ============================================
 # Debug & Admin Reset Endpoints
 # ============================================
 
 @app.get("/debug/users")
-async def debug_users(db: Session = Depends(get_db)):
+async def debug_users(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
     """Debug endpoint to list all users and check authentication."""
     from .services.auth_service import get_password_hash, verify_password
+
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
     
-    users = db.query(User).all()
     result = []
-    
-    for user in users:
-        # Test password for admin and seller
-        test_password = "admin123" if user.username == "admin" else "seller123"
-        can_verify = verify_password(test_password, user.password_hash)
-        
-        result.append({
-            "id": user.id,
-            "username": user.username,
-            "role": user.role,
-            "password_hash": user.password_hash[:20] + "...",  # Truncated for security
-            "password_matches": can_verify
-        })
-    
+
+    async def _verify_batch(batch):
+        # Verify a batch concurrently: the checks are independent and
+        # hashing releases the GIL, so wall time is one check, not N
+        verdicts = await asyncio.gather(*[
+            asyncio.to_thread(
+                verify_password,
+                "admin123" if user.username == "admin" else "seller123",
+                user.password_hash
+            )
+            for user in batch
+        ])
+        for user, can_verify in zip(batch, verdicts):
+            result.append({
+                "id": user.id,
+                "username": user.username,
+                "role": user.role,
+                "password_hash": user.password_hash[:20] + "...",  # Truncated for security
+                "password_matches": can_verify
+            })
+
+    # yield_per streams rows in pages instead of materializing every User
+    # object up front, so memory stays bounded on large user tables
+    batch = []
+    for user in db.query(User).yield_per(200):
+        batch.append(user)
+        if len(batch) >= 200:
+            await _verify_batch(batch)
+            batch = []
+    if batch:
+        await _verify_batch(batch)
+
     return {
         "users": result,
-        "total": len(users),
+        "total": len(result),
         "note": "If password_matches is false, visit /admin/reset-users to reset passwords"
     }
 
-@app.post("/admin/reset-users")
+@app.api_route("/admin/reset-users", methods=["GET", "POST"])
 async def reset_users(db: Session = Depends(get_db)):
-    """POST endpoint to reset/Create default admin and seller users."""
-    from .services.auth_service import get_password_hash
-    
+    """Reset/create the default admin and seller users (GET kept for browser access)."""
     result = {"created": [], "updated": []}
     
     # Create or update admin
     admin = db.query(User).filter(User.username == "admin").first()
     if admin:
-        admin.password_hash = get_password_hash("admin123")
+        admin.password_hash = ADMIN_DEFAULT_HASH
         admin.role = "admin"
         result["updated"].append("admin")
     else:
         admin = User(
             username="admin",
-            password_hash=get_password_hash("admin123"),
+            password_hash=ADMIN_DEFAULT_HASH,
             role="admin"
         )
         db.add(admin)
@@ -1365,20 +2023,21 @@ async def reset_users(db: Session = Depends(get_db)):
     # Create or update seller
     seller = db.query(User).filter(User.username == "seller").first()
     if seller:
-        seller.password_hash = get_password_hash("seller123")
+        seller.password_hash = SELLER_DEFAULT_HASH
         seller.role = "seller"
         result["updated"].append("seller")
     else:
         seller = User(
             username="seller",
-            password_hash=get_password_hash("seller123"),
+            password_hash=SELLER_DEFAULT_HASH,
             role="seller"
         )
         db.add(seller)
         result["created"].append("seller")
     
     db.commit()
-    
+    _invalidate_user_caches()
+
     return {
         "status": "success",
         "message": "Default users reset successfully",
@@ -1389,74 +2048,114 @@ async def reset_users(db: Session = Depends(get_db)):
         "result": result
     }
 
-# Also create a GET version for browser access
-@app.get("/admin/reset-users")
-async def reset_users_get(db: Session = Depends(get_db)):
-    """GET endpoint to reset/Create default admin and seller users."""
-    return await reset_users(db)
 
-@app.get("/metrics")
-async def metrics():
-    """Prometheus-compatible metrics endpoint."""
-    global request_count, request_times
-    
-    # Calculate percentiles
-    if request_times:
-        sorted_times = sorted(request_times)
-        p50 = sorted_times[int(len(sorted_times) * 0.50)]
-        p95 = sorted_times[int(len(sorted_times) * 0.95)]
-        p99 = sorted_times[int(len(sorted_times) * 0.99)]
-    else:
-        p50 = p95 = p99 = 0
-    
-    # Get service status
-    status = llm_service.get_status()
-    
-    metrics_text = f"""# HELP jucca_requests_total Total number of requests
+# Static /metrics framing, built once at import; scrapes only format values
+_METRICS_HEADER = """# HELP jucca_requests_total Total number of requests
 # TYPE jucca_requests_total counter
-jucca_requests_total {request_count}
+jucca_requests_total {0}
 
 # HELP jucca_request_duration_seconds Request duration in seconds
 # TYPE jucca_request_duration_seconds histogram
 """
-    
-    # Add histogram buckets (simplified)
-    for threshold in [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]:
-        count = sum(1 for t in request_times if t <= threshold)
-        metrics_text += f'jucca_request_duration_seconds_bucket{{le="{threshold}"}} {count}\n'
-    
-    metrics_text += f'jucca_request_duration_seconds_bucket{{le="+Inf"}} {len(request_times)}\n'
-    metrics_text += f'jucca_request_duration_seconds_sum {sum(request_times)}\n'
-    metrics_text += f'jucca_request_duration_seconds_count {len(request_times)}\n'
-    
-    # Additional metrics
-    metrics_text += f"""
+
+_METRICS_PERCENTILES = """
+# HELP jucca_request_duration_p50_seconds Median request duration over the sample window
+# TYPE jucca_request_duration_p50_seconds gauge
+jucca_request_duration_p50_seconds {p50}
+
+# HELP jucca_request_duration_p95_seconds 95th percentile request duration over the sample window
+# TYPE jucca_request_duration_p95_seconds gauge
+jucca_request_duration_p95_seconds {p95}
+
+# HELP jucca_request_duration_p99_seconds 99th percentile request duration over the sample window
+# TYPE jucca_request_duration_p99_seconds gauge
+jucca_request_duration_p99_seconds {p99}
+"""
+
+_METRICS_GAUGES = """
 # HELP jucca_cache_size Current cache size
 # TYPE jucca_cache_size gauge
-jucca_cache_size {status["cache"]["size"]}
+jucca_cache_size {cache_size}
+
+# HELP jucca_ask_cache_hit_rate Fraction of /ask lookups served from cache
+# TYPE jucca_ask_cache_hit_rate gauge
+jucca_ask_cache_hit_rate {hit_rate:.4f}
 
 # HELP jucca_load_active_requests Active requests
 # TYPE jucca_load_active_requests gauge
-jucca_load_active_requests {status["load"]["active_requests"]}
+jucca_load_active_requests {active}
 
 # HELP jucca_load_capacity_used_percent Capacity used percentage
 # TYPE jucca_load_capacity_used_percent gauge
-jucca_load_capacity_used_percent {float(status["load"]["capacity_used"].replace("%", "")) / 100}
+jucca_load_capacity_used_percent {capacity}
 
 # HELP jucca_requests_total_total Total requests
 # TYPE jucca_requests_total_total counter
-jucca_requests_total_total {status["load"]["total_requests"]}
+jucca_requests_total_total {total}
 
 # HELP jucca_requests_failed_total Failed requests
 # TYPE jucca_requests_failed_total counter
-jucca_requests_failed_total {status["load"]["failed_requests"]}
+jucca_requests_failed_total {failed}
 
 # HELP jucca_model_loaded Model loaded status
 # TYPE jucca_model_loaded gauge
-jucca_model_loaded {1 if status["model"]["loaded"] else 0}
+jucca_model_loaded {model_loaded}
+
+# HELP jucca_db_pool_checked_out Database connections currently in use
+# TYPE jucca_db_pool_checked_out gauge
+jucca_db_pool_checked_out {pool_checked_out}
 """
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus-compatible metrics endpoint."""
+    global request_count
+    
+    # Snapshot once per scrape so concurrent appends cannot race the sort;
+    # the rolling window feeds only the percentile gauges - buckets come
+    # from the online counters below
+    sorted_times = sorted(request_times)
+    if sorted_times:
+        p50 = sorted_times[int(len(sorted_times) * 0.50)]
+        p95 = sorted_times[int(len(sorted_times) * 0.95)]
+        p99 = sorted_times[int(len(sorted_times) * 0.99)]
+    else:
+        p50 = p95 = p99 = 0
+    
+    # Get service status
+    status = _get_llm_status()
     
-    return Response(content=metrics_text, media_type="text/plain")
+    # Collect fragments and join once at the end; += on a str copies the
+    # whole accumulated buffer on every append
+    parts = [_METRICS_HEADER.format(request_count)]
+
+    # Histogram buckets come straight off the online counters - a running
+    # cumulative sum over 8 ints, no pass over the samples at all
+    cumulative = 0
+    for threshold, bucket_count in zip(DURATION_BUCKETS, _duration_bucket_counts):
+        cumulative += bucket_count
+        parts.append(f'jucca_request_duration_seconds_bucket{{le="{threshold}"}} {cumulative}\n')
+
+    parts.append(f'jucca_request_duration_seconds_bucket{{le="+Inf"}} {_duration_totals["count"]}\n')
+    parts.append(f'jucca_request_duration_seconds_sum {_duration_totals["sum"]}\n')
+    parts.append(f'jucca_request_duration_seconds_count {_duration_totals["count"]}\n')
+
+    parts.append(_METRICS_PERCENTILES.format(p50=p50, p95=p95, p99=p99))
+
+    # Additional metrics: static HELP/TYPE framing is prebuilt at import,
+    # only the values are formatted in per scrape
+    parts.append(_METRICS_GAUGES.format(
+        cache_size=status["cache"]["size"],
+        hit_rate=ask_cache.hit_rate(),
+        active=status["load"]["active_requests"],
+        capacity=float(status["load"]["capacity_used"].replace("%", "")) / 100,
+        total=status["load"]["total_requests"],
+        failed=status["load"]["failed_requests"],
+        model_loaded=1 if status["model"]["loaded"] else 0,
+        pool_checked_out=engine.pool.checkedout(),
+    ))
+
+    return Response(content="".join(parts), media_type="text/plain")
 
 
 # ============================================
@@ -1466,7 +2165,7 @@ jucca_model_loaded {1 if status["model"]["loaded"] else 0}
 @app.get("/status")
 async def service_status():
     """Get detailed service status."""
-    status = llm_service.get_status()
+    status = _get_llm_status()
     
     return {
         "service": "JUCCA",
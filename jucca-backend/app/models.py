@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -36,6 +36,16 @@ class ProhibitedProduct(Base):
     status = Column(String, default="prohibited")
     notes = Column(Text, nullable=True)
 
+    # Compliance checks filter on keyword and country together
+    __table_args__ = (
+        Index("ix_prohib_kw_country", keyword, country),
+    )
+
+class PolicyMeta(Base):
+    __tablename__ = "policy_meta"
+    key = Column(String, primary_key=True)
+    value = Column(String)
+
 class ChatHistory(Base):
     __tablename__ = "chat_history"
     id = Column(Integer, primary_key=True, index=True)
@@ -56,3 +66,9 @@ class SystemLog(Base):
     ip_address = Column(String, nullable=True)
     extra_data = Column(Text, nullable=True)  # JSON string for additional data
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Matches /admin/logs' "ORDER BY created_at DESC" plus level/category
+    # filters so the page comes straight off the index without a sort
+    __table_args__ = (
+        Index("ix_syslog_created_level_cat", created_at.desc(), level, category),
+    )
@@ -2,6 +2,8 @@ import os
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 import hashlib
+import hmac
+import time
 
 SECRET_KEY = os.getenv("SECRET_KEY", "jucca-secret-key-change-in-production")
 ALGORITHM = "HS256"
@@ -9,7 +11,13 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password using SHA-256 (for demo purposes)."""
-    return get_password_hash(plain_password) == hashed_password
+    # Compare raw digests: skips the hex encode and is constant-time
+    digest = hashlib.sha256(plain_password.encode()).digest()
+    try:
+        stored = bytes.fromhex(hashed_password)
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest, stored)
 
 def get_password_hash(password: str) -> str:
     """Hash password using SHA-256 (for demo purposes)."""
@@ -24,13 +32,31 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# Decoded-token cache: signature verification is repeated compute on an
+# immutable token, so payloads are memoized until the token expires. The
+# cache is wiped wholesale when full; tokens re-verify on the next call.
+_token_cache = {}
+_TOKEN_CACHE_MAX = 4096
+
 def decode_token(token: str) -> dict:
+    cached = _token_cache.get(token)
+    if cached is not None:
+        payload, exp = cached
+        if exp is None or exp > time.time():
+            return payload
+        _token_cache.pop(token, None)
+        return None
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    if len(_token_cache) >= _TOKEN_CACHE_MAX:
+        _token_cache.clear()
+    _token_cache[token] = (payload, payload.get("exp"))
+    return payload
+
 def authenticate_user(username: str, password: str, db):
     from ..models import User
     user = db.query(User).filter(User.username == username).first()
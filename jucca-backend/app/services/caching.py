@@ -0,0 +1,69 @@
+"""In-process response cache for the /ask endpoints.
+
+A bounded LRU with per-entry TTL, keyed on a BLAKE2b digest of the
+request parameters that determine the answer. A hit skips entity
+extraction, the policy engine pass and LLM inference entirely, turning
+a repeat question into a single dict lookup.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCacheTTL:
+    """Bounded LRU cache whose entries also expire after a fixed TTL."""
+
+    def __init__(self, max_entries: int = 10000, ttl: int = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """Return the cached value for key, or None if absent or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value):
+        """Store value under key, evicting the least-recently-used entries."""
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache since startup."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def build_ask_cache_key(question: str, country, category, role: str) -> str:
+    """Stable digest of the parameters that determine a compliance answer."""
+    raw = f"{question.strip().casefold()}|{country}|{category}|{role}"
+    # BLAKE2b is faster than SHA-256 for short inputs and 16 bytes is
+    # plenty of key space for an in-process cache
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+# Shared instance used by the /ask endpoints
+ask_cache = LRUCacheTTL(max_entries=10000, ttl=3600)
@@ -12,6 +12,7 @@ This module provides LLM capabilities using GPT4All with:
 import os
 import hashlib
 import json
+import threading
 import time
 import logging
 from datetime import datetime, timedelta
@@ -532,6 +533,10 @@ class LLMService:
     def __init__(self):
         self.cache = response_cache
         self.load_manager = load_manager
+        # In-flight generations keyed by cache key, so concurrent identical
+        # requests share one forward pass instead of queueing their own
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
     
     def _try_local_model(self, prompt: str, **kwargs) -> Optional[str]:
         """Try to generate response using local GPT4All model."""
@@ -571,16 +576,51 @@ class LLMService:
     
     def generate(self, question: str, decision: str, reason: str,
                 role: str = "seller", detected_entities: Optional[dict] = None) -> str:
-        """Generate LLM response with caching and fallback."""
-        start_time = time.time()
-        
+        """Generate LLM response with caching and fallback.
+
+        Concurrent requests for the same prompt are coalesced: the first
+        caller runs the model and the rest wait for its cached result.
+        GPT4All serializes generations anyway, so duplicate prompts queued
+        behind the leader would only add latency for no new output.
+        """
         # Check cache first
         if LLMConfig.CACHE_ENABLED:
             cached = self.cache.get(question, decision, reason, role, detected_entities)
             if cached:
                 logger.debug("Returning cached response")
                 return cached
-        
+        else:
+            # No cache to hand results between callers, so no coalescing
+            return self._generate_uncached(question, decision, reason, role, detected_entities)
+
+        key = self.cache._generate_key(question, decision, reason, role, detected_entities)
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = threading.Event()
+                self._inflight[key] = event
+
+        if not leader:
+            event.wait(LLMConfig.REQUEST_TIMEOUT_SECONDS)
+            cached = self.cache.get(question, decision, reason, role, detected_entities)
+            if cached:
+                return cached
+            # Leader failed or timed out; generate independently
+
+        try:
+            return self._generate_uncached(question, decision, reason, role, detected_entities)
+        finally:
+            if leader:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    def _generate_uncached(self, question: str, decision: str, reason: str,
+                           role: str = "seller", detected_entities: Optional[dict] = None) -> str:
+        """Run the fallback hierarchy for a cache miss and store the result."""
+        start_time = time.time()
+
         # Check if overloaded, use cloud directly
         use_cloud = self.load_manager.should_use_cloud()
         
@@ -612,30 +652,47 @@ class LLMService:
         return response
     
     def generate_streaming(self, question: str, decision: str, reason: str,
-                          role: str = "seller", 
+                          role: str = "seller",
                           detected_entities: Optional[dict] = None) -> AsyncGenerator[str, None]:
         """Generate streaming LLM response."""
+        # Serve cached answers in small chunks so repeat questions skip
+        # inference entirely but the client still sees a stream
+        if LLMConfig.CACHE_ENABLED:
+            cached = self.cache.get(question, decision, reason, role, detected_entities)
+            if cached:
+                for i in range(0, len(cached), 20):
+                    yield cached[i:i + 20]
+                return
+
         prompt = build_prompt(question, decision, reason, role, detected_entities)
-        
+
         # Try local model first
         if gpt4all_manager.is_healthy():
             try:
+                chunks = []
                 for chunk in gpt4all_manager.generate_streaming(prompt):
+                    chunks.append(chunk)
                     yield chunk
+                if LLMConfig.CACHE_ENABLED and chunks:
+                    self.cache.set(question, decision, reason, role, "".join(chunks), detected_entities)
                 return
             except Exception as e:
                 logger.error(f"Local streaming failed: {e}")
-        
+
         # Try cloud fallback
         if cloud_client.is_available():
             try:
+                chunks = []
                 for chunk in cloud_client.generate_streaming(prompt):
+                    chunks.append(chunk)
                     yield chunk
+                if LLMConfig.CACHE_ENABLED and chunks:
+                    self.cache.set(question, decision, reason, role, "".join(chunks), detected_entities)
                 return
             except Exception as e:
                 logger.error(f"Cloud streaming failed: {e}")
-        
-        # Fallback to non-streaming
+
+        # Fallback to non-streaming (generate() handles its own caching)
         response = self.generate(question, decision, reason, role, detected_entities)
         yield response
     
@@ -1,22 +1,45 @@
 # Simple in-memory session storage for demo
 # In production, use Redis or database-backed storage
 
+import time
+
+# Sessions idle longer than this are dropped, so guest traffic cannot
+# grow the store without bound. Expired entries are swept lazily at
+# most once per minute, keeping the per-request cost at dict lookups.
+SESSION_TTL = 3600
+SWEEP_INTERVAL = 60
+
 memory_store = {}
+_last_seen = {}
+_next_sweep = {"at": 0.0}
+
+def _touch(session_id: str, now: float):
+    """Record activity for a session and opportunistically sweep expired ones."""
+    _last_seen[session_id] = now
+    if now >= _next_sweep["at"]:
+        _next_sweep["at"] = now + SWEEP_INTERVAL
+        cutoff = now - SESSION_TTL
+        for sid in [s for s, ts in _last_seen.items() if ts < cutoff]:
+            memory_store.pop(sid, None)
+            _last_seen.pop(sid, None)
 
 def update_memory(session_id: str, data: dict):
     """Update session memory with new data."""
-    if session_id not in memory_store:
-        memory_store[session_id] = {}
-    memory_store[session_id].update(data)
+    _touch(session_id, time.time())
+    memory_store.setdefault(session_id, {}).update(data)
 
 def get_memory(session_id: str) -> dict:
     """Retrieve session memory."""
-    return memory_store.get(session_id, {})
+    memory = memory_store.get(session_id)
+    if memory is None:
+        return {}
+    _touch(session_id, time.time())
+    return memory
 
 def clear_memory(session_id: str):
     """Clear session memory."""
-    if session_id in memory_store:
-        del memory_store[session_id]
+    memory_store.pop(session_id, None)
+    _last_seen.pop(session_id, None)
 
 def get_conversation_history(session_id: str, limit: int = 10) -> list:
     """Get recent conversation history for a session."""
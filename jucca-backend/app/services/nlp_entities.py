@@ -63,6 +63,11 @@ KNOWN_BRANDS = [
     "mac", "maybelline", "loreal", "revlon"
 ]
 
+# Precompiled once at import: the fallback brand matcher and the common
+# words it must ignore; extract_entities runs on every /ask request
+_CAP_WORD_RE = re.compile(r"\b[A-Z][a-zA-Z]{2,}\b")
+_NOT_BRANDS = frozenset(("can", "the", "this", "what", "how", "selling", "sell"))
+
 def extract_entities(question: str):
     """Extract brand, category, country, and flags from natural language question."""
     q = question.lower().strip()
@@ -91,11 +96,11 @@ def extract_entities(question: str):
     
     # Also try capitalized word detection as fallback
     if not brand:
-        brand_matches = re.findall(r"\b[A-Z][a-zA-Z]{2,}\b", question)
-        if brand_matches:
-            potential_brand = brand_matches[0]
+        match = _CAP_WORD_RE.search(question)
+        if match:
+            potential_brand = match.group()
             # Verify it's not a common word
-            if potential_brand.lower() not in ["can", "the", "this", "what", "how", "selling", "sell"]:
+            if potential_brand.lower() not in _NOT_BRANDS:
                 brand = potential_brand
     
     # Detect flags
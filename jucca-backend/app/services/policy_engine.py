@@ -1,3 +1,5 @@
+import time
+
 import pandas as pd
 from rapidfuzz import fuzz
 from sqlalchemy.orm import Session
@@ -163,11 +165,47 @@ COMMON_WORDS = {
 }
 
 
+# Policy tables change only through admin uploads, yet every compliance
+# check re-queried and re-hydrated all three as ORM objects. The checkers
+# only read plain column values, so the rows are cached process-wide as
+# lightweight Row tuples. The version counter invalidates immediately
+# after a write in this process; the TTL bounds how long other uvicorn
+# workers (which never see the bump) can serve decisions from old tables.
+_POLICY_SNAPSHOT_TTL = 10
+_policy_data_version = [0]
+_policy_snapshot = {"version": -1, "expires": 0.0,
+                    "keywords": (), "brands": (), "products": ()}
+
+def bump_policy_version():
+    """Invalidate the cached policy snapshot after any policy-table write."""
+    _policy_data_version[0] += 1
+
+def _get_policy_snapshot(db: Session) -> dict:
+    if (_policy_snapshot["version"] != _policy_data_version[0]
+            or time.time() >= _policy_snapshot["expires"]):
+        _policy_snapshot["keywords"] = db.query(
+            BlacklistedKeyword.keyword, BlacklistedKeyword.severity,
+            BlacklistedKeyword.description).all()
+        _policy_snapshot["brands"] = db.query(
+            RestrictedBrand.brand, RestrictedBrand.status,
+            RestrictedBrand.condition).all()
+        _policy_snapshot["products"] = db.query(
+            ProhibitedProduct.keyword, ProhibitedProduct.category,
+            ProhibitedProduct.country, ProhibitedProduct.status,
+            ProhibitedProduct.notes).all()
+        _policy_snapshot["version"] = _policy_data_version[0]
+        _policy_snapshot["expires"] = time.time() + _POLICY_SNAPSHOT_TTL
+    return _policy_snapshot
+
+
 class PolicyEngine:
-    def __init__(self, db: Session):
-        self.db = db
-    
-    def check_compliance(self, question: str, country: str = None, category: str = None):
+    """Compliance checker shared across requests.
+
+    The engine itself holds no per-request state; callers pass the active
+    DB session into each method so one instance can live on app.state.
+    """
+
+    def check_compliance(self, db: Session, question: str, country: str = None, category: str = None):
         """Main compliance checking function."""
         q = question.lower()
         findings = {
@@ -180,10 +218,10 @@ class PolicyEngine:
         }
         
         # 1. Check blacklisted keywords
-        keyword_issues, detected_keywords = self._check_blacklisted_keywords(q)
+        keyword_issues, detected_keywords = self._check_blacklisted_keywords(db, q)
         
         # 2. Check prohibited products (only if question is product-related)
-        product_issues, product_statuses = self._check_prohibited_products(q, country, category)
+        product_issues, product_statuses = self._check_prohibited_products(db, q, country, category)
         if product_issues:
             findings["issues"].extend(product_issues)
             findings["detected_products"] = list(set(findings.get("detected_products", []) + 
@@ -201,7 +239,7 @@ class PolicyEngine:
             # If only "open" or "allowed" statuses, keep decision as "Allowed"
         
         # 3. Check restricted brands (only if question is brand-related)
-        brand_issues, detected_brands = self._check_restricted_brands(q, country)
+        brand_issues, detected_brands = self._check_restricted_brands(db, q, country)
         if brand_issues:
             findings["issues"].extend(brand_issues)
             findings["detected_brands"] = detected_brands
@@ -237,9 +275,9 @@ class PolicyEngine:
         
         return findings
     
-    def _check_blacklisted_keywords(self, question: str):
+    def _check_blacklisted_keywords(self, db: Session, question: str):
         """Check for blacklisted keywords in the question."""
-        keywords = self.db.query(BlacklistedKeyword).all()
+        keywords = _get_policy_snapshot(db)["keywords"]
         issues = []
         detected = []
         
@@ -298,12 +336,12 @@ class PolicyEngine:
         
         return issues, detected
     
-    def _check_prohibited_products(self, question: str, country: str = None, category: str = None):
+    def _check_prohibited_products(self, db: Session, question: str, country: str = None, category: str = None):
         """
         Check if the product is prohibited - only matches when question is about a specific product.
         Returns tuple of (issues, statuses) where statuses indicates whether products are allowed/prohibited.
         """
-        products = self.db.query(ProhibitedProduct).all()
+        products = _get_policy_snapshot(db)["products"]
         issues = []
         statuses = []
         
@@ -374,12 +412,12 @@ class PolicyEngine:
         
         return issues, statuses
     
-    def _check_restricted_brands(self, question: str, country: str = None):
+    def _check_restricted_brands(self, db: Session, question: str, country: str = None):
         """
         Check if any restricted brands are mentioned in the question.
         Only matches when brand name (or alias) appears explicitly in the question.
         """
-        brands = self.db.query(RestrictedBrand).all()
+        brands = _get_policy_snapshot(db)["brands"]
         issues = []
         detected = []
         
@@ -546,7 +584,7 @@ class PolicyEngine:
                     else:
                         return f"Contains restricted keywords: {keywords_list}."
     
-    def rebuild_from_excel(self, filepath: str):
+    def rebuild_from_excel(self, db: Session, filepath: str):
         """Rebuild policy tables from Excel file."""
         excel_file = pd.ExcelFile(filepath)
         results = {}
@@ -554,7 +592,7 @@ class PolicyEngine:
         # Process Blacklisted Words sheet
         if "Blacklisted Words" in excel_file.sheet_names:
             df = pd.read_excel(excel_file, sheet_name="Blacklisted Words")
-            self.db.query(BlacklistedKeyword).delete()
+            db.query(BlacklistedKeyword).delete()
             for _, row in df.iterrows():
                 keyword = BlacklistedKeyword(
                     keyword=str(row.get("Keyword", "")).strip(),
@@ -562,13 +600,13 @@ class PolicyEngine:
                     scope=str(row.get("Scope", "global")).lower(),
                     description=str(row.get("Description", "")) if pd.notna(row.get("Description")) else None
                 )
-                self.db.add(keyword)
+                db.add(keyword)
             results["keywords"] = len(df)
         
         # Process Restricted Brands sheet
         if "Restricted Brands" in excel_file.sheet_names:
             df = pd.read_excel(excel_file, sheet_name="Restricted Brands")
-            self.db.query(RestrictedBrand).delete()
+            db.query(RestrictedBrand).delete()
             for _, row in df.iterrows():
                 brand = RestrictedBrand(
                     brand=str(row.get("Brand", "")).strip(),
@@ -577,13 +615,13 @@ class PolicyEngine:
                     status=str(row.get("Status", "restricted")).lower(),
                     condition=str(row.get("Condition", "")) if pd.notna(row.get("Condition")) else None
                 )
-                self.db.add(brand)
+                db.add(brand)
             results["brands"] = len(df)
         
         # Process Prohibited Categories sheet
         if "Prohibited Categories" in excel_file.sheet_names:
             df = pd.read_excel(excel_file, sheet_name="Prohibited Categories")
-            self.db.query(ProhibitedProduct).delete()
+            db.query(ProhibitedProduct).delete()
             for _, row in df.iterrows():
                 product = ProhibitedProduct(
                     keyword=str(row.get("Keyword", "")).strip(),
@@ -592,8 +630,9 @@ class PolicyEngine:
                     status=str(row.get("Status", "prohibited")).lower(),
                     notes=str(row.get("Notes", "")) if pd.notna(row.get("Notes")) else None
                 )
-                self.db.add(product)
+                db.add(product)
             results["products"] = len(df)
         
-        self.db.commit()
+        db.commit()
+        bump_policy_version()
         return results